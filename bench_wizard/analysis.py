@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from bench_wizard.parser import RAW_TIME_COLUMN, BenchmarkParser
+
+R_SQUARED_WARNING = 0.9
+OUTLIER_THRESHOLD = 3.5  # modified z-score of residual
+NON_LINEARITY_THRESHOLD = 0.1  # relative reduction of residuals by quadratic term
+
+
+@dataclass
+class ExtrinsicAnalysis:
+    """Result of linear model fit of extrinsic time to its components"""
+
+    extrinsic: str
+    samples: int
+    base: float
+    slopes: Dict[str, float]
+    r_squared: float
+    outliers: int
+    non_linear: List[str] = field(default_factory=list)
+
+    @property
+    def warnings(self) -> List[str]:
+        warnings = []
+        if self.r_squared < R_SQUARED_WARNING:
+            warnings.append(f"poor fit (R²={self.r_squared:.3f})")
+        if self.outliers:
+            warnings.append(f"{self.outliers} outliers")
+        for component in self.non_linear:
+            warnings.append(f"non-linear in {component}")
+        return warnings
+
+
+def to_array(columns: List[str], rows: List[str]) -> np.ndarray:
+    """Convert raw csv rows into 2d array in one pass"""
+    if not rows:
+        return np.empty((0, len(columns)))
+
+    data = np.fromstring(",".join(rows), sep=",")
+    return data.reshape(len(rows), len(columns))
+
+
+def _residual_sum(design: np.ndarray, y: np.ndarray) -> float:
+    coef, *_ = np.linalg.lstsq(design, y, rcond=None)
+    residuals = y - design @ coef
+    return float(residuals @ residuals)
+
+
+def _outliers(residuals: np.ndarray) -> np.ndarray:
+    """Mask of samples with residual far from the median (modified z-score)"""
+    median = np.median(residuals)
+    mad = np.median(np.abs(residuals - median))
+
+    if mad == 0:
+        return np.zeros(residuals.shape, dtype=bool)
+
+    z = 0.6745 * (residuals - median) / mad
+    return np.abs(z) > OUTLIER_THRESHOLD
+
+
+def analyse_extrinsic(
+    extrinsic: str, columns: List[str], rows: List[str]
+) -> ExtrinsicAnalysis:
+    data = to_array(columns, rows)
+
+    time_idx = next(i for i, c in enumerate(columns) if c.startswith(RAW_TIME_COLUMN))
+    components = columns[:time_idx]
+
+    y = data[:, time_idx]
+    x = data[:, :time_idx]
+    design = np.column_stack([np.ones(len(y)), x])
+
+    coef, *_ = np.linalg.lstsq(design, y, rcond=None)
+    residuals = y - design @ coef
+    ss_res = float(residuals @ residuals)
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    r_squared = 1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0
+
+    outliers = _outliers(residuals)
+
+    # non-linearity is judged without outliers - few extreme samples would
+    # otherwise dominate the residuals and hide the curvature
+    inliers = ~outliers
+    if outliers.any() and np.count_nonzero(inliers) > design.shape[1]:
+        design, y, x = design[inliers], y[inliers], x[inliers]
+        ss_linear = _residual_sum(design, y)
+    else:
+        ss_linear = ss_res
+
+    non_linear = []
+    for idx, component in enumerate(components):
+        values = x[:, idx]
+        # quadratic term is indistinguishable from linear one with less than 3 points
+        if ss_linear == 0 or np.unique(values).size < 3:
+            continue
+
+        ss_quadratic = _residual_sum(np.column_stack([design, values**2]), y)
+        if (ss_linear - ss_quadratic) / ss_linear > NON_LINEARITY_THRESHOLD:
+            non_linear.append(component)
+
+    return ExtrinsicAnalysis(
+        extrinsic=extrinsic,
+        samples=len(residuals),
+        base=float(coef[0]),
+        slopes={c: float(s) for c, s in zip(components, coef[1:])},
+        r_squared=r_squared,
+        outliers=int(np.count_nonzero(outliers)),
+        non_linear=non_linear,
+    )
+
+
+def analyse(parser: BenchmarkParser) -> List[ExtrinsicAnalysis]:
+    return [
+        analyse_extrinsic(extrinsic, columns, rows)
+        for (extrinsic, (columns, rows)) in parser.raw_data.items()
+        if rows
+    ]
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import os
+import shutil
 import subprocess
+import tempfile
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from bench_wizard import cache
 from bench_wizard.cargo import Cargo
 from bench_wizard.exceptions import BenchmarkCargoException
 from bench_wizard.output import Output
+from bench_wizard.parser import BenchmarkParser
+from bench_wizard.profiler import record_command, summarize
+from bench_wizard.timeline import Timeline
+from bench_wizard.weights import compare
+
+# Only end of stderr of failed benchmark is kept - it contains the error
+ERROR_TAIL = 4096  # bytes
 
 
 @dataclass
@@ -17,20 +27,29 @@ class BenchmarksConfig:
     output_dir: Optional[str] = None
     template: Optional[str] = None
     chain: Optional[str] = "dev"
+    analyze: bool = False
+    extrinsic: str = "*"
+    profile: bool = False
+    tolerance: Optional[float] = None
+    cache_dir: Optional[str] = None
+    build: bool = True
+    parse: bool = False  # return parsed results of completed benchmarks
 
 
 class Benchmark:
     """Represents single benchmark"""
 
-    def __init__(self, pallet: str, command: [str]):
+    def __init__(self, pallet: str, command: [str], profile: Optional[str] = None):
         self._pallet = pallet
-        self._stdout = None
+        self._stdout = None  # spool file with benchmark output
         self._command = command
+        self._profile = profile
         self._total_time = 0
 
         self._completed = False
         self._acceptable = False
         self._rerun = False
+        self._cached = False
 
         self._error = False
         self._error_reason = None
@@ -48,40 +67,107 @@ class Benchmark:
         return self._error
 
     @property
-    def raw(self) -> bytes:
+    def output(self) -> Optional[str]:
+        """Path of spool file with benchmark output"""
         return self._stdout
 
+    @property
+    def profile(self) -> Optional[str]:
+        return self._profile
+
+    @property
+    def cached(self) -> bool:
+        return self._cached
+
+    def parse(self) -> BenchmarkParser:
+        return BenchmarkParser.from_file(self._stdout)
+
+    def restore(self, path: str) -> None:
+        """Use result of previous run instead of running the benchmark"""
+        with self._spool() as f:
+            pass
+
+        shutil.copyfile(path, f.name)
+
+        self._stdout = f.name
+        self._cached = True
+        self._completed = True
+
     def run(self, rerun: bool = False) -> None:
         """Run benchmark and parse the result"""
-        result = subprocess.run(self._command, capture_output=True)
-
-        if result.returncode != 0:
-            self._error = True
-            self._error_reason = result.stderr.decode("utf-8")
+        command = self._command
+        if self._profile:
+            command = record_command(command, self._profile)
+
+        self.close()
+
+        # output goes directly into files so it is never held in memory as a whole
+        with self._spool() as stdout, tempfile.TemporaryFile() as stderr:
+            try:
+                result = subprocess.run(command, stdout=stdout, stderr=stderr)
+            except BaseException:
+                # eg. command not found - spool file is not deleted on close
+                stdout.close()
+                os.remove(stdout.name)
+                raise
+
+            if result.returncode != 0:
+                self._error = True
+                self._error_reason = _tail(stderr, ERROR_TAIL).decode(
+                    "utf-8", errors="replace"
+                )
+
+        if self._error:
+            os.remove(stdout.name)
             return
 
-        self._stdout = result.stdout
+        self._stdout = stdout.name
         self._rerun = rerun
         self._completed = True
 
     def dump(self, dest: str) -> None:
         """Write benchmark result to a destination file."""
-        with open(os.path.join(dest, f"{self._pallet}.results"), "wb") as f:
-            f.write(self._stdout)
+        shutil.copyfile(self._stdout, os.path.join(dest, f"{self._pallet}.results"))
+
+    def close(self) -> None:
+        """Remove spool file of benchmark output"""
+        if self._stdout and os.path.isfile(self._stdout):
+            os.remove(self._stdout)
+        self._stdout = None
+
+    def _spool(self):
+        return tempfile.NamedTemporaryFile(
+            prefix=f"bench-wizard-{self._pallet}-", suffix=".out", delete=False
+        )
 
     @property
     def rerun(self):
         return self._rerun
 
 
+def _tail(f, size: int) -> bytes:
+    f.seek(0, os.SEEK_END)
+    f.seek(max(f.tell() - size, 0))
+    return f.read()
+
+
 def _prepare_benchmarks(config: BenchmarksConfig) -> List[Benchmark]:
     benchmarks = []
 
     for pallet in config.pallets:
-        cargo = Cargo(pallet=pallet, template=config.template, chain=config.chain)
+        cargo = Cargo(
+            pallet=pallet,
+            template=config.template,
+            chain=config.chain,
+            extrinsic=config.extrinsic,
+            raw=config.analyze,
+        )
 
         if config.output_dir:
             output_file = os.path.join(config.output_dir, f"{pallet}.rs")
+            if config.tolerance is not None:
+                # existing weight file is replaced only if weights changed
+                output_file = f"{output_file}.new"
             cargo.output = output_file
 
         benchmarks.append(Benchmark(pallet, cargo.command()))
@@ -89,15 +175,115 @@ def _prepare_benchmarks(config: BenchmarksConfig) -> List[Benchmark]:
     return benchmarks
 
 
-def _run_benchmarks(benchmarks: List[Benchmark], output: Output) -> None:
+def _run_benchmarks(
+    benchmarks: List[Benchmark], output: Output, timeline: Timeline
+) -> None:
+    benchmarks = [bench for bench in benchmarks if not bench.cached]
+
     output.track(benchmarks)
     for bench in benchmarks:
         # Output updates to easily show progress
         output.update(bench)
-        bench.run()
+        with timeline.span("run", pallet=bench.pallet):
+            bench.run()
         output.update(bench)
 
 
+def _profile(
+    benchmarks: List[Benchmark],
+    config: BenchmarksConfig,
+    output: Output,
+    timeline: Timeline,
+) -> None:
+    # profiled run is separate so profiler overhead does not get into weights,
+    # dumped results or analysis
+    os.makedirs(config.dump_results, exist_ok=True)
+
+    for bench in benchmarks:
+        if not bench.completed:
+            continue
+
+        output.info(f"Profiling {bench.pallet} - this may take a while...")
+
+        cargo = Cargo(
+            pallet=bench.pallet, chain=config.chain, extrinsic=config.extrinsic
+        )
+        profile = os.path.join(config.dump_results, f"{bench.pallet}.perf.data")
+        profiled = Benchmark(bench.pallet, cargo.command(), profile=profile)
+        with timeline.span("profile", pallet=bench.pallet):
+            try:
+                profiled.run()
+            finally:
+                profiled.close()
+            if os.path.isfile(profile):
+                output.profile(bench.pallet, summarize(profile))
+
+
+def _cache_key(source: str, pallet: str, config: BenchmarksConfig) -> str:
+    return cache.fingerprint(
+        source,
+        pallet,
+        config.chain,
+        config.template,
+        config.extrinsic,
+        config.analyze,
+    )
+
+
+def _restore_cached(
+    benchmarks: List[Benchmark], config: BenchmarksConfig, source: str
+) -> None:
+    for bench in benchmarks:
+        if config.output_dir and not os.path.isfile(
+            os.path.join(config.output_dir, f"{bench.pallet}.rs")
+        ):
+            continue
+
+        cached = cache.load_file(
+            config.cache_dir, "results", _cache_key(source, bench.pallet, config)
+        )
+        if cached is not None:
+            bench.restore(cached)
+
+
+def _store_results(
+    benchmarks: List[Benchmark], config: BenchmarksConfig, source: str
+) -> None:
+    for bench in benchmarks:
+        if bench.completed and not bench.cached:
+            cache.store_file(
+                config.cache_dir,
+                "results",
+                _cache_key(source, bench.pallet, config),
+                bench.output,
+            )
+
+
+def _update_weight_file(pallet: str, config: BenchmarksConfig, output: Output) -> None:
+    target = os.path.join(config.output_dir, f"{pallet}.rs")
+    generated = f"{target}.new"
+
+    if not os.path.isfile(generated):
+        return
+
+    current = ""
+    if os.path.isfile(target):
+        with open(target, "r") as f:
+            current = f.read()
+
+    with open(generated, "r") as f:
+        changes = compare(current, f.read(), config.tolerance)
+
+    updated = any(change.changed for change in changes)
+
+    if updated:
+        os.replace(generated, target)
+    else:
+        os.remove(generated)
+
+    output.weight_changes(pallet, changes, updated)
+
+
 def _build_with_runtime_features(manifest: str) -> None:
     command = [
         "cargo",
@@ -113,24 +299,80 @@ def _build_with_runtime_features(manifest: str) -> None:
         raise BenchmarkCargoException(result.stderr.decode("utf-8"))
 
 
-def run_pallet_benchmarks(config: BenchmarksConfig, to_output: Output) -> None:
+def run_pallet_benchmarks(
+    config: BenchmarksConfig, to_output: Output, timeline: Optional[Timeline] = None
+) -> Dict[str, BenchmarkParser]:
+    timeline = timeline or Timeline()
+
     benchmarks = _prepare_benchmarks(config)
-    pallets = []
-    for bench in benchmarks:
-        pallets.append(bench.pallet)
+    results = dict()
 
-    to_output.info(f"Benchmarking: {pallets}")
+    try:
+        pallets = []
+        for bench in benchmarks:
+            pallets.append(bench.pallet)
+
+        to_output.info(f"Benchmarking: {pallets}")
+
+        source = None
+        if config.cache_dir:
+            source = cache.source_fingerprint(
+                [path for path in (config.output_dir, config.dump_results) if path]
+            )
+            if source:
+                _restore_cached(benchmarks, config, source)
+            else:
+                to_output.info("Not a git repository - results cache disabled")
+
+        if all(bench.cached for bench in benchmarks):
+            to_output.info("All results cached - nothing to run")
+        else:
+            if config.build:
+                to_output.info("Compiling - this may take a while...")
+
+                with timeline.span("build"):
+                    _build_with_runtime_features("node/Cargo.toml")
+
+            to_output.info("Running benchmarks - this may take a while...")
 
-    to_output.info("Compiling - this may take a while...")
+            _run_benchmarks(benchmarks, to_output, timeline)
 
-    _build_with_runtime_features("node/Cargo.toml")
+        with timeline.span("write"):
+            if source:
+                _store_results(benchmarks, config, source)
 
-    to_output.info("Running benchmarks - this may take a while...")
+            if config.output_dir and config.tolerance is not None:
+                for bench in benchmarks:
+                    if bench.completed and not bench.cached:
+                        _update_weight_file(bench.pallet, config, to_output)
 
-    _run_benchmarks(benchmarks, to_output)
+            if config.dump_results:
+                for bench in benchmarks:
+                    if bench.completed:
+                        bench.dump(config.dump_results)
 
-    to_output.results(benchmarks)
+        to_output.results(benchmarks)
 
-    if config.dump_results:
+        if config.profile:
+            _profile(benchmarks, config, to_output, timeline)
+
+        if config.analyze:
+            # numpy is imported only when analysis is requested
+            from bench_wizard.analysis import analyse
+
+        for bench in benchmarks:
+            if not bench.completed or not (config.analyze or config.parse):
+                continue
+
+            with timeline.span("parse", pallet=bench.pallet):
+                parser = bench.parse()
+
+            if config.analyze:
+                to_output.analysis(bench.pallet, analyse(parser))
+            if config.parse:
+                results[bench.pallet] = parser
+    finally:
         for bench in benchmarks:
-            bench.dump(config.dump_results)
+            bench.close()
+
+    return results
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from typing import Any, Callable, List, Optional
+
+DEFAULT_CACHE_DIR = ".bench-wizard"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of json serializable parts - used as cache key"""
+    data = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+def directory_fingerprint(
+    path: str, ignore: Optional[Callable[[str], bool]] = None
+) -> str:
+    """Fingerprint of directory content based on file names and sizes.
+
+    Content itself is not hashed - chain databases are too large for that.
+    Files for which `ignore` returns True are skipped.
+    """
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            if ignore and ignore(name):
+                continue
+            full = os.path.join(root, name)
+            entries.append((os.path.relpath(full, path), os.path.getsize(full)))
+
+    entries.sort()
+    return fingerprint(entries)
+
+
+def source_fingerprint(exclude: Optional[List[str]] = None) -> Optional[str]:
+    """Fingerprint of git revision including uncommitted changes of tracked files
+
+    None if current directory is not a git repository. Changes in excluded
+    directories (eg. weight files and results written by benchmarks) are
+    ignored. Sources are not told apart - any other change changes fingerprint.
+    """
+    head = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True)
+
+    if head.returncode != 0:
+        return None
+
+    top = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True)
+    root = top.stdout.decode().strip()
+
+    pathspec = []
+    for path in exclude or []:
+        relative = os.path.relpath(os.path.realpath(path), os.path.realpath(root))
+        if relative != os.curdir and not relative.startswith(os.pardir):
+            pathspec.append(f":(top,exclude){relative}")
+
+    diff = subprocess.run(["git", "diff", "HEAD", "--"] + pathspec, capture_output=True)
+
+    return fingerprint(
+        head.stdout.decode().strip(), diff.stdout.decode("utf-8", errors="replace")
+    )
+
+
+def _entry_path(cache_dir: str, namespace: str, key: str, suffix: str = "json") -> str:
+    return os.path.join(cache_dir, namespace, f"{key}.{suffix}")
+
+
+def load(cache_dir: str, namespace: str, key: str) -> Optional[Any]:
+    path = _entry_path(cache_dir, namespace, key)
+
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def store(cache_dir: str, namespace: str, key: str, data: Any) -> None:
+    path = _entry_path(cache_dir, namespace, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # write to temporary file first so interrupted run does not leave broken entry
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+
+    os.replace(tmp, path)
+
+
+def load_file(cache_dir: str, namespace: str, key: str) -> Optional[str]:
+    """Path of file stored in cache - None if there is none"""
+    path = _entry_path(cache_dir, namespace, key, "out")
+
+    return path if os.path.isfile(path) else None
+
+
+def store_file(cache_dir: str, namespace: str, key: str, source: str) -> None:
+    """Copy file into cache - content is never loaded into memory"""
+    path = _entry_path(cache_dir, namespace, key, "out")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp = f"{path}.tmp"
+    shutil.copyfile(source, tmp)
+
+    os.replace(tmp, path)
@@ -15,6 +15,7 @@ class Cargo:
     heap_pages: int = 4096
     output: Optional[str] = None
     template: Optional[str] = None
+    raw: bool = False
 
     def command(self) -> List[str]:
         cmd = [
@@ -39,5 +40,46 @@ class Cargo:
             cmd.append(f"--output={self.output}")
         if self.template:
             cmd.append(f"--template={self.template}")
+        if self.raw:
+            cmd.append("--raw")
+
+        return cmd
+
+
+@dataclass
+class StorageCargo:
+    base_path: str
+    manifest: str = "node/Cargo.toml"
+    chain: str = "dev"
+    db: str = "rocksdb"
+    state_version: int = 1
+    warmups: int = 1
+    json_read_path: Optional[str] = None
+    json_write_path: Optional[str] = None
+    skip_write: bool = False
+
+    def command(self) -> List[str]:
+        cmd = [
+            "cargo",
+            "run",
+            "--release",
+            "--features=runtime-benchmarks",
+            f"--manifest-path={self.manifest}",
+            "--",
+            "benchmark",
+            "storage",
+            f"--chain={self.chain}",
+            f"--base-path={self.base_path}",
+            f"--db={self.db}",
+            f"--state-version={self.state_version}",
+            f"--warmups={self.warmups}",
+        ]
+
+        if self.json_read_path:
+            cmd.append(f"--json-read-path={self.json_read_path}")
+        if self.json_write_path:
+            cmd.append(f"--json-write-path={self.json_write_path}")
+        if self.skip_write:
+            cmd.append("--skip-write")
 
         return cmd
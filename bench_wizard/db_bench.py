@@ -1,9 +1,19 @@
 import json
 import os
+import statistics
 import subprocess
+import tempfile
 from dataclasses import dataclass
 
-from typing import Tuple, Union
+from typing import List, Optional, Tuple, Union
+
+from bench_wizard import cache
+from bench_wizard.cargo import StorageCargo
+from bench_wizard.hardware import hardware_info
+from bench_wizard.timeline import Timeline
+
+# Files which change whenever the database is opened - not part of snapshot fingerprint
+VOLATILE_DB_FILES = ("LOG", "LOCK", "CURRENT", "IDENTITY", "MANIFEST-", "OPTIONS-")
 
 
 @dataclass
@@ -11,7 +21,21 @@ class DBPerformanceConfig:
     substrate_dir: str
 
 
-def db_benchmark(config: DBPerformanceConfig) -> Union[None, Tuple[dict, dict]]:
+@dataclass
+class StorageBenchmarkConfig:
+    base_path: str
+    chain: str = "dev"
+    db: str = "rocksdb"
+    skip_write: bool = False
+    reuse: bool = False
+    cache_dir: str = cache.DEFAULT_CACHE_DIR
+
+
+def db_benchmark(
+    config: DBPerformanceConfig, timeline: Optional[Timeline] = None
+) -> Union[None, Tuple[dict, dict]]:
+    timeline = timeline or Timeline()
+
     print("Performing Database read/write benchmark ( this may take a while ) ... ")
 
     # clone only if dir does not exit
@@ -21,7 +45,8 @@ def db_benchmark(config: DBPerformanceConfig) -> Union[None, Tuple[dict, dict]]:
         command = f"git clone https://github.com/paritytech/substrate.git {config.substrate_dir}".split(
             " "
         )
-        result = subprocess.run(command)
+        with timeline.span("clone"):
+            result = subprocess.run(command)
 
         if result.returncode != 0:
             print("Failed to clone substrate repository")
@@ -34,17 +59,19 @@ def db_benchmark(config: DBPerformanceConfig) -> Union[None, Tuple[dict, dict]]:
         "cargo run --release -p node-bench -- ::trie::write::large --json".split(" ")
     )
 
-    read_result = subprocess.run(
-        read_benchmark_command, capture_output=True, cwd=config.substrate_dir
-    )
+    with timeline.span("read"):
+        read_result = subprocess.run(
+            read_benchmark_command, capture_output=True, cwd=config.substrate_dir
+        )
 
     if read_result.returncode != 0:
         print(f"Failed to run read DB benchmarks: {read_result.stderr}")
         return None
 
-    write_result = subprocess.run(
-        write_benchmark_command, capture_output=True, cwd=config.substrate_dir
-    )
+    with timeline.span("write"):
+        write_result = subprocess.run(
+            write_benchmark_command, capture_output=True, cwd=config.substrate_dir
+        )
 
     if write_result.returncode != 0:
         print(f"Failed to run read DB benchmarks: {write_result.stderr}")
@@ -85,6 +112,134 @@ def display_db_benchmark_results(results: tuple) -> None:
     print("")
 
 
-def run_db_benchmark(config: DBPerformanceConfig):
-    results = db_benchmark(config)
+def run_db_benchmark(config: DBPerformanceConfig, timeline: Optional[Timeline] = None):
+    results = db_benchmark(config, timeline)
     display_db_benchmark_results(results)
+
+
+def _is_volatile_db_file(name: str) -> bool:
+    return name.startswith(VOLATILE_DB_FILES) or name.endswith(".log")
+
+
+def _load_records(path: str) -> List[Tuple[int, int]]:
+    """Load raw `benchmark storage` json output as list of (size, ns) tuples"""
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    return [(int(size), int(ns)) for (size, ns) in data["ns_per_size"]]
+
+
+def size_bucket(size: int) -> int:
+    """Upper bound (power of two) of the size bucket"""
+    if size <= 1:
+        return size
+    return 1 << (size - 1).bit_length()
+
+
+def bucket_records(records: List[Tuple[int, int]]) -> List[dict]:
+    """Time statistics of all measured records per value size bucket"""
+    buckets = dict()
+    for size, ns in records:
+        buckets.setdefault(size_bucket(size), []).append(ns)
+
+    stats = []
+    for bucket in sorted(buckets):
+        times = sorted(buckets[bucket])
+        stats.append(
+            {
+                "size": bucket,
+                "count": len(times),
+                "average": statistics.mean(times),
+                "median": statistics.median(times),
+                "p99": times[min(len(times) - 1, int(len(times) * 0.99))],
+            }
+        )
+
+    return stats
+
+
+def _storage_key(config: StorageBenchmarkConfig) -> Optional[str]:
+    # measured times depend on the snapshot, the machine and the node build
+    source = cache.source_fingerprint()
+    if source is None:
+        return None
+
+    snapshot = cache.directory_fingerprint(
+        config.base_path, ignore=_is_volatile_db_file
+    )
+    return cache.fingerprint(
+        snapshot,
+        hardware_info()["fingerprint"],
+        source,
+        config.chain,
+        config.db,
+        config.skip_write,
+    )
+
+
+def storage_benchmark(config: StorageBenchmarkConfig) -> Optional[dict]:
+    print("Performing storage benchmark ( this may take a while ) ... ")
+
+    key = _storage_key(config)
+
+    if config.reuse:
+        cached = cache.load(config.cache_dir, "storage", key) if key else None
+        if cached is not None:
+            print(f"Reusing results of previous run on {config.base_path}")
+            return cached
+        print("No results of previous run on this snapshot, hardware and node")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        read_path = os.path.join(tmp, "read.json")
+        write_path = os.path.join(tmp, "write.json")
+
+        cargo = StorageCargo(
+            base_path=config.base_path,
+            chain=config.chain,
+            db=config.db,
+            json_read_path=read_path,
+            json_write_path=write_path,
+            skip_write=config.skip_write,
+        )
+
+        result = subprocess.run(cargo.command(), capture_output=True)
+
+        if result.returncode != 0:
+            print(f"Failed to run storage benchmark: {result.stderr}")
+            return None
+
+        # only statistics are kept - there is a record for every key of the snapshot
+        results = {
+            "read": bucket_records(_load_records(read_path)),
+            "write": (
+                [] if config.skip_write else bucket_records(_load_records(write_path))
+            ),
+        }
+
+    if key:
+        cache.store(config.cache_dir, "storage", key, results)
+
+    return results
+
+
+def display_storage_benchmark_results(results: Optional[dict]) -> None:
+    if not results:
+        print("Failed to run storage benchmark")
+        return
+
+    print("Storage benchmark results (value size buckets):\n")
+    print(
+        f"{'Operation':^11}|{'Size (bytes)':^16}|{'Count':^10}|{'Average(ns)':^16}|{'Median(ns)':^16}|{'p99(ns)':^16}"
+    )
+
+    for oper in ("read", "write"):
+        for stats in results[oper]:
+            print(
+                f"{oper:<11}| {'<= ' + str(stats['size']):^14} | {stats['count']:^8} | {stats['average']:^14.0f} | {stats['median']:^14.0f} | {stats['p99']:^14}"
+            )
+    print("")
+
+
+def run_storage_benchmark(config: StorageBenchmarkConfig):
+    results = storage_benchmark(config)
+    display_storage_benchmark_results(results)
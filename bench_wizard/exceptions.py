@@ -2,3 +2,15 @@ class BenchmarkCargoException(Exception):
     """Raised when cargo command results in failure"""
 
     pass
+
+
+class BenchmarkProfilerException(Exception):
+    """Raised when profiler is not available or fails to process profile"""
+
+    pass
+
+
+class BenchmarkReferenceException(Exception):
+    """Raised when reference values are missing or invalid"""
+
+    pass
@@ -0,0 +1,38 @@
+import os
+import platform
+from typing import Dict
+
+from bench_wizard import cache
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+
+    return platform.processor() or platform.machine()
+
+
+def _memory() -> int:
+    """Total memory in bytes, 0 if not available"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def hardware_info() -> Dict[str, str]:
+    info = {
+        "cpu": _cpu_model(),
+        "cores": str(os.cpu_count() or 0),
+        "memory": str(_memory()),
+    }
+    # operating system is not part of the fingerprint - only the hardware
+    info["fingerprint"] = cache.fingerprint(info)[:12]
+    info["system"] = f"{platform.system()} {platform.release()}"
+
+    return info
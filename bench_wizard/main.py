@@ -1,3 +1,4 @@
+import importlib.util
 import os
 import sys
 from typing import Optional
@@ -6,10 +7,26 @@ import click
 
 from bench_wizard import __version__
 from bench_wizard.benchmark import run_pallet_benchmarks, BenchmarksConfig
-from bench_wizard.db_bench import DBPerformanceConfig, run_db_benchmark
-from bench_wizard.exceptions import BenchmarkCargoException
+from bench_wizard.cache import DEFAULT_CACHE_DIR
+from bench_wizard.db_bench import (
+    DBPerformanceConfig,
+    StorageBenchmarkConfig,
+    run_db_benchmark,
+    run_storage_benchmark,
+)
+from bench_wizard.exceptions import (
+    BenchmarkCargoException,
+    BenchmarkProfilerException,
+    BenchmarkReferenceException,
+)
 from bench_wizard.output import Output, PerformanceOutput
-from bench_wizard.performance import run_pallet_performance, PerformanceConfig
+from bench_wizard.reference import DEFAULT_PROFILE
+from bench_wizard.performance import (
+    run_calibration,
+    run_pallet_performance,
+    PerformanceConfig,
+)
+from bench_wizard.suite import SuiteConfig, run_suite
 
 
 @click.group()
@@ -60,13 +77,66 @@ def version():
     required=False,
     help="Weight hbs template file ",
 )
+@click.option(
+    "-a",
+    "--analyze",
+    is_flag=True,
+    help="Collect raw data and analyze extrinsic components",
+)
+@click.option(
+    "-e",
+    "--extrinsic",
+    type=str,
+    required=False,
+    default="*",
+    help="Extrinsic",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Record perf profiles into dump results directory",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    required=False,
+    help="Rewrite weight files only if weights changed by more than given percent",
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Reuse results of previous run if no tracked file changed since - "
+    "any change in the repository runs all pallets again",
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    required=False,
+    default=DEFAULT_CACHE_DIR,
+    help="Cache directory",
+)
 def benchmark(
     pallet: list,
     chain: str,
     dump_results: Optional[str],
     template: Optional[str],
     output_dir: Optional[str],
+    analyze: bool,
+    extrinsic: str,
+    profile: bool,
+    tolerance: Optional[float],
+    cache: bool,
+    cache_dir: str,
 ):
+    if profile and not dump_results:
+        print("--profile requires --dump-results directory", file=sys.stderr)
+        exit(1)
+
+    if analyze and importlib.util.find_spec("numpy") is None:
+        print(
+            "--analyze requires numpy - install bench-wizard[analysis]", file=sys.stderr
+        )
+        exit(1)
 
     config = BenchmarksConfig(
         pallets=pallet,
@@ -74,9 +144,18 @@ def benchmark(
         template=template,
         output_dir=output_dir,
         chain=chain,
+        analyze=analyze,
+        extrinsic=extrinsic,
+        profile=profile,
+        tolerance=tolerance,
+        cache_dir=cache_dir if cache else None,
     )
 
-    run_pallet_benchmarks(config, Output())
+    try:
+        run_pallet_benchmarks(config, Output())
+    except BenchmarkProfilerException as e:
+        print(str(e), file=sys.stderr)
+        exit(1)
 
 
 @main.command("pc")
@@ -103,10 +182,34 @@ def benchmark(
     default="dev",
     help="chain",
 )
+@click.option(
+    "--profile",
+    "profile_dir",
+    type=str,
+    required=False,
+    help="Record perf profiles of failed pallets into directory",
+)
+@click.option(
+    "-rp",
+    "--reference-profile",
+    type=str,
+    required=False,
+    help="Reference profile, required if reference values have more profiles",
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    required=False,
+    default=DEFAULT_CACHE_DIR,
+    help="Cache directory",
+)
 def pc(
     reference_values: str,
     pallet: list,
     chain: str,
+    profile_dir: Optional[str],
+    reference_profile: Optional[str],
+    cache_dir: str,
 ):
 
     if not os.path.isfile(reference_values):
@@ -114,11 +217,81 @@ def pc(
         exit(1)
 
     config = PerformanceConfig(
-        reference_values=reference_values, pallets=pallet, chain=chain
+        reference_values=reference_values,
+        pallets=pallet,
+        chain=chain,
+        profile_dir=profile_dir,
+        reference_profile=reference_profile,
+        cache_dir=cache_dir,
     )
 
     try:
         run_pallet_performance(config, PerformanceOutput())
+    except (
+        BenchmarkCargoException,
+        BenchmarkProfilerException,
+        BenchmarkReferenceException,
+    ) as e:
+        print(str(e), file=sys.stderr)
+        exit(1)
+
+
+@main.command("calibrate")
+@click.option(
+    "-rf",
+    "--reference-values",
+    type=str,
+    required=True,
+    help="Reference values - json format, created if it does not exist",
+)
+@click.option(
+    "-rp",
+    "--reference-profile",
+    type=str,
+    required=False,
+    default=DEFAULT_PROFILE,
+    help="Reference profile to create or update",
+)
+@click.option(
+    "-p",
+    "--pallet",
+    type=str,
+    multiple=True,
+    required=True,
+    help="Pallets",
+)
+@click.option(
+    "-c",
+    "--chain",
+    type=str,
+    required=False,
+    default="dev",
+    help="chain",
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    required=False,
+    default=DEFAULT_CACHE_DIR,
+    help="Cache directory",
+)
+def calibrate(
+    reference_values: str,
+    reference_profile: str,
+    pallet: list,
+    chain: str,
+    cache_dir: str,
+):
+    config = PerformanceConfig(
+        reference_values=reference_values,
+        pallets=pallet,
+        chain=chain,
+        reference_profile=reference_profile,
+        cache_dir=cache_dir,
+    )
+
+    try:
+        run_calibration(config, PerformanceOutput())
     except BenchmarkCargoException as e:
         print(str(e), file=sys.stderr)
         exit(1)
@@ -140,3 +313,167 @@ def db_benchmark(
     )
 
     run_db_benchmark(config)
+
+
+@main.command("storage")
+@click.option(
+    "-b",
+    "--base-path",
+    type=str,
+    required=True,
+    help="Chain database snapshot directory",
+)
+@click.option(
+    "-c",
+    "--chain",
+    type=str,
+    required=False,
+    default="dev",
+    help="chain",
+)
+@click.option(
+    "--db",
+    type=click.Choice(["rocksdb", "paritydb"]),
+    required=False,
+    default="rocksdb",
+    help="Database backend of the snapshot",
+)
+@click.option(
+    "--skip-write",
+    is_flag=True,
+    help="Benchmark only storage reads",
+)
+@click.option(
+    "--reuse",
+    is_flag=True,
+    help="Reuse results of previous run on the same snapshot, hardware and node",
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    required=False,
+    default=DEFAULT_CACHE_DIR,
+    help="Cache directory",
+)
+def storage_benchmark(
+    base_path: str,
+    chain: str,
+    db: str,
+    skip_write: bool,
+    reuse: bool,
+    cache_dir: str,
+):
+    if not os.path.isdir(base_path):
+        print(f"{base_path} does not exist", file=sys.stderr)
+        exit(1)
+
+    config = StorageBenchmarkConfig(
+        base_path=base_path,
+        chain=chain,
+        db=db,
+        skip_write=skip_write,
+        reuse=reuse,
+        cache_dir=cache_dir,
+    )
+
+    run_storage_benchmark(config)
+
+
+@main.command("suite")
+@click.option(
+    "-p",
+    "--pallet",
+    type=str,
+    multiple=True,
+    required=True,
+    help="Pallets",
+)
+@click.option(
+    "-c",
+    "--chain",
+    type=str,
+    required=False,
+    default="dev",
+    help="chain",
+)
+@click.option(
+    "-rf",
+    "--reference-values",
+    type=str,
+    required=False,
+    help="Reference values - json format, performance check is skipped if not set",
+)
+@click.option(
+    "-rp",
+    "--reference-profile",
+    type=str,
+    required=False,
+    help="Reference profile, required if reference values have more profiles",
+)
+@click.option(
+    "-s",
+    "--substrate-dir",
+    type=str,
+    required=False,
+    help="Substrate directory, db benchmark is skipped if not set",
+)
+@click.option(
+    "-d",
+    "--dump-results",
+    type=str,
+    required=False,
+    help="Directory to dump benchmarks results",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=str,
+    required=False,
+    help="Save weights into rust file",
+)
+@click.option(
+    "--trace",
+    type=str,
+    required=False,
+    default="bench-wizard-trace.json",
+    help="Chrome trace output file",
+)
+@click.option(
+    "--metrics",
+    type=str,
+    required=False,
+    default="bench-wizard.prom",
+    help="Prometheus textfile output file",
+)
+def suite(
+    pallet: list,
+    chain: str,
+    reference_values: Optional[str],
+    reference_profile: Optional[str],
+    substrate_dir: Optional[str],
+    dump_results: Optional[str],
+    output_dir: Optional[str],
+    trace: str,
+    metrics: str,
+):
+    if reference_values and not os.path.isfile(reference_values):
+        print(f"{reference_values} does not exist", file=sys.stderr)
+        exit(1)
+
+    config = SuiteConfig(
+        pallets=pallet,
+        chain=chain,
+        reference_values=reference_values,
+        reference_profile=reference_profile,
+        substrate_dir=substrate_dir,
+        dump_results=dump_results,
+        output_dir=output_dir,
+        trace=trace,
+        metrics=metrics,
+    )
+
+    try:
+        run_suite(config, Output())
+    except (BenchmarkCargoException, BenchmarkReferenceException) as e:
+        print(str(e), file=sys.stderr)
+        exit(1)
@@ -1,7 +1,10 @@
-from typing import Any, TYPE_CHECKING
+from typing import Any, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .analysis import ExtrinsicAnalysis
     from .benchmark import Benchmark
+    from .timeline import Timeline
+    from .weights import WeightChange
     from .performance import PalletPerformance
 
 
@@ -43,7 +46,7 @@ class Output:
         self.info(f"{'Pallet':^25}|{'Result': ^12}")
 
         for bench in benchmarks:
-            note = "Failed" if bench.is_error else "Ok"
+            note = "Failed" if bench.is_error else "Cached" if bench.cached else "Ok"
 
             if bench.is_error:
                 reason = bench._error_reason.split("\n")[-2]
@@ -52,6 +55,59 @@ class Output:
 
             self.print(f"{bench.pallet:<25}| {note:^10} | {reason}")
 
+    def timings(self, timeline: "Timeline"):
+        self.info("\nTimings:\n")
+
+        self.info(f"{'Step':^40}|{'Duration (s)':^14}")
+
+        for span in sorted(timeline.spans, key=lambda s: s.start):
+            step = "  " * span.path.count("/") + span.name
+            if span.args:
+                step += f" ({', '.join(span.args.values())})"
+
+            self.print(f"{step:<40}| {span.duration:^12.2f}")
+
+    def weight_changes(self, pallet: str, changes: ["WeightChange"], updated: bool):
+        status = "updated" if updated else "unchanged"
+        self.info(f"\nWeights ({pallet}.rs {status}):\n")
+
+        for change in changes:
+            if change.old is None:
+                diff = "new"
+            elif change.new is None:
+                diff = "removed"
+            elif change.percentage is None:
+                diff = ""
+            else:
+                diff = f"{change.percentage:+.2f}%"
+
+            note = "*" if change.changed else ""
+
+            self.print(f"{change.extrinsic:<30}| {diff:^12} | {note}")
+
+    def analysis(self, pallet: str, analyses: ["ExtrinsicAnalysis"]):
+        self.info(f"\nComponent analysis ({pallet}):\n")
+
+        self.info(
+            f"{'Extrinsic':^30}|{'Samples':^10}|{'R²':^9}|{'Base (ns)':^14}|{'Slopes (ns)':^30}| Warnings"
+        )
+
+        for item in analyses:
+            slopes = ", ".join(f"{c}={s:.1f}" for (c, s) in item.slopes.items())
+            warnings = ", ".join(item.warnings)
+
+            self.print(
+                f"{item.extrinsic:<30}| {item.samples:^8} | {item.r_squared:^7.3f} | {item.base:^12.1f} | {slopes:^28} | {warnings}"
+            )
+
+    def profile(self, pallet: str, frames: [Tuple[str, float]]):
+        self.info(f"\nHot frames ({pallet}):\n")
+
+        self.info(f"{'Self (%)':^10}| Frame")
+
+        for frame, percentage in frames:
+            self.print(f"{percentage:^10.2f}| {frame}")
+
 
 class PerformanceOutput:
     """A class used to handle console output"""
@@ -102,6 +158,14 @@ class PerformanceOutput:
                 f"{bench.pallet:<25}| {times:^25} | {diff:^14}| {percentage:^14} | {note:^10} | {rerun:^10}"
             )
 
+    def profile(self, pallet: str, frames: [Tuple[str, float]]):
+        self.info(f"\nHot frames ({pallet}):\n")
+
+        self.info(f"{'Self (%)':^10}| Frame")
+
+        for frame, percentage in frames:
+            self.print(f"{percentage:^10.2f}| {frame}")
+
     def footnote(self):
         self.print("\nNotes:")
         self.print(
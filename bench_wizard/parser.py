@@ -1,4 +1,11 @@
-from typing import List
+import io
+import mmap
+import os
+from typing import Dict, Iterator, List, Tuple, Union
+
+# Column of raw benchmark data holding extrinsic time, prefix is used
+# as older substrate versions do not have the unit suffix
+RAW_TIME_COLUMN = "extrinsic_time"
 
 
 class BenchmarkParser:
@@ -8,18 +15,39 @@ class BenchmarkParser:
        Definitely needs refactoring and be improved.
     """
 
-    def __init__(self, result: bytes):
+    def __init__(self, result: Union[bytes, mmap.mmap]):
         self._output = result
 
         self._pallet = None
         self._extrinsics = dict()
+        self._raw = dict()
 
         self.process()
 
+    @classmethod
+    def from_file(cls, path: str) -> "BenchmarkParser":
+        """Parse output stored in file - file is memory mapped, not read at once"""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"")
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return cls(data)
+
     @property
     def pallet(self) -> str:
         return self._pallet
 
+    @property
+    def extrinsics(self) -> Dict[str, float]:
+        """Time of each extrinsic (µs)"""
+        return self._extrinsics
+
+    @property
+    def raw_data(self) -> Dict[str, Tuple[List[str], List[str]]]:
+        """Raw data per extrinsic as (columns, rows) - only for output of `--raw` run"""
+        return self._raw
+
     def total_time(self, extrinsics: [str]) -> float:
         return sum(
             [
@@ -30,21 +58,48 @@ class BenchmarkParser:
         )
 
     def process(self) -> None:
-        lines = list(map(lambda x: x.decode(), self._output.split(b"\n")))
+        extrinsic = None
+        searching_time = False
+        searching_raw = False
+        rows = None
+
+        # output is processed line by line - it is never split as a whole
+        for line in self._lines():
+            if rows is not None:
+                row = line.strip()
+                if row and row[0].isdigit():
+                    rows.append(row)
+                    continue
+                rows = None
 
-        for idx, line in enumerate(lines):
             if line.startswith("Pallet:"):
+                if searching_time:
+                    # we did not find time for some reason
+                    raise IOError(
+                        f"Failed to find time for an extrinsic. Invalid format?!"
+                    )
                 info = line.split(",")
                 self._pallet = info[0].split(":")[1].strip()[1:-1]
                 extrinsic = info[1].split(":")[1].strip()[1:-1]
-                time = self.extract_time(lines[idx + 1 :])
-                self._extrinsics[extrinsic] = time
-
-    @staticmethod
-    def extract_time(data: List[str]) -> float:
-        for entry in data:
-            if entry.startswith("Time"):
-                return float(entry.split(" ")[-1])
-            if entry.startswith("Pallet:"):
-                # we did not find time for some reason
-                raise IOError(f"Failed to find time for an extrinsic. Invalid format?!")
+                self._extrinsics[extrinsic] = None
+                searching_time = searching_raw = True
+            elif searching_time and line.startswith("Time"):
+                self._extrinsics[extrinsic] = float(line.split(" ")[-1])
+                searching_time = searching_raw = False
+            elif searching_raw and RAW_TIME_COLUMN in line:
+                # raw data are printed right after the pallet line
+                rows = []
+                self._raw[extrinsic] = (line.strip().rstrip(",").split(","), rows)
+                searching_raw = False
+            elif line.startswith("Median Slopes"):
+                searching_raw = False
+
+    def _lines(self) -> Iterator[str]:
+        if isinstance(self._output, mmap.mmap):
+            self._output.seek(0)
+            readline = self._output.readline
+        else:
+            readline = io.BytesIO(self._output).readline
+
+        for line in iter(readline, b""):
+            yield line.decode().rstrip("\n")
@@ -1,14 +1,17 @@
-import json
+import os
 import subprocess
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from bench_wizard import cache
 from bench_wizard.benchmark import Benchmark
 from bench_wizard.cargo import Cargo
 from bench_wizard.exceptions import BenchmarkCargoException
 from bench_wizard.output import PerformanceOutput
-
 from bench_wizard.parser import BenchmarkParser
+from bench_wizard.profiler import summarize
+from bench_wizard.reference import DEFAULT_PROFILE, ReferenceIndex, update_reference
+from bench_wizard.timeline import Timeline
 
 # TODO: need as configurable option
 DIFF_MARGIN = 10  # percent
@@ -19,6 +22,10 @@ class PerformanceConfig:
     pallets: [str]
     reference_values: str
     chain: Optional[str] = "dev"
+    profile_dir: Optional[str] = None
+    build: bool = True
+    reference_profile: Optional[str] = None
+    cache_dir: str = cache.DEFAULT_CACHE_DIR
 
 
 class PalletPerformance:
@@ -26,7 +33,6 @@ class PalletPerformance:
         self, pallet: str, ref_value: float, extrinsics: list, chain: str = "dev"
     ):
         self._pallet = pallet
-        self._stdout = None
         self._ref_value = ref_value
         self._extrinsics = extrinsics
 
@@ -59,26 +65,31 @@ class PalletPerformance:
     def completed(self) -> bool:
         return self._completed
 
-    @property
-    def raw(self) -> bytes:
-        return self._stdout
-
-    def run(self, rerun: bool = False) -> None:
+    def run(self, rerun: bool = False, timeline: Optional[Timeline] = None) -> None:
         """Run benchmark and parse the result"""
+        timeline = timeline or Timeline()
 
         cargo = Cargo(pallet=self.pallet, chain=self._chain)
         benchmark = Benchmark(self.pallet, cargo.command())
-        benchmark.run()
+        with timeline.span("run", pallet=self.pallet):
+            benchmark.run()
 
         if benchmark.is_error:
             self._is_error = True
             self._error_reason = benchmark._error_reason
             return
 
-        self._stdout = benchmark.raw
+        try:
+            with timeline.span("parse", pallet=self.pallet):
+                parser = benchmark.parse()
+        finally:
+            benchmark.close()
 
-        parser = BenchmarkParser(benchmark.raw)
+        self.evaluate(parser)
+        self._rerun = rerun
 
+    def evaluate(self, parser: BenchmarkParser) -> None:
+        """Compare parsed benchmark result with reference value"""
         self._total_time = parser.total_time(self._extrinsics)
 
         margin = int(self._ref_value * DIFF_MARGIN / 100)
@@ -86,7 +97,6 @@ class PalletPerformance:
         diff = int(self._ref_value - self._total_time)
 
         self.acceptable = diff >= -margin
-        self._rerun = rerun
         self._completed = True
 
     @property
@@ -111,36 +121,84 @@ class PalletPerformance:
 
 
 def _prepare_benchmarks(
-    config: PerformanceConfig, reference_values: dict
+    config: PerformanceConfig, reference: ReferenceIndex
 ) -> List[PalletPerformance]:
     benchmarks = []
+    profile = reference.profile(config.reference_profile)
 
     for pallet in config.pallets:
-        ref_data = reference_values[pallet]
-        ref_value = sum(list(map(lambda x: float(x), ref_data.values())))
+        # total is precomputed in the index, only extrinsic names are loaded
+        ref_value = reference.total(profile, pallet)
+        extrinsics = reference.values(profile, pallet).keys()
         benchmarks.append(
-            PalletPerformance(pallet, ref_value, ref_data.keys(), chain=config.chain)
+            PalletPerformance(pallet, ref_value, extrinsics, chain=config.chain)
         )
 
     return benchmarks
 
 
 def _run_benchmarks(
-    benchmarks: List[PalletPerformance], output: PerformanceOutput, rerun=False
+    benchmarks: List[PalletPerformance],
+    output: PerformanceOutput,
+    timeline: Timeline,
+    rerun=False,
 ) -> None:
     # Note : this can be simplified into one statement
 
     if rerun:
-        [bench.run(rerun) for bench in benchmarks if bench.acceptable is False]
+        [
+            bench.run(rerun, timeline)
+            for bench in benchmarks
+            if bench.acceptable is False
+        ]
     else:
         output.track(benchmarks)
         for bench in benchmarks:
             # Output updates to easily show progress
             output.update(bench)
-            bench.run()
+            bench.run(timeline=timeline)
             output.update(bench)
 
 
+def _rerun_single_failure(
+    benchmarks: List[PalletPerformance],
+    output: PerformanceOutput,
+    timeline: Timeline,
+) -> None:
+    if [b.acceptable for b in benchmarks].count(False) == 1:
+        # if only one failed - rerun it
+        _run_benchmarks(benchmarks, output, timeline, True)
+
+
+def _profile_failed(
+    benchmarks: List[PalletPerformance],
+    config: PerformanceConfig,
+    output: PerformanceOutput,
+    timeline: Timeline,
+) -> None:
+    # profiled run is separate so profiler overhead does not affect the comparison
+    os.makedirs(config.profile_dir, exist_ok=True)
+
+    for bench in benchmarks:
+        # pallet which failed to run would fail again under profiler
+        if bench.acceptable or bench._is_error:
+            continue
+
+        output.info(f"Profiling {bench.pallet} - this may take a while...")
+
+        cargo = Cargo(pallet=bench.pallet, chain=config.chain)
+        profile = os.path.join(config.profile_dir, f"{bench.pallet}.perf.data")
+        profiled = Benchmark(bench.pallet, cargo.command(), profile=profile)
+        with timeline.span("profile", pallet=bench.pallet):
+            profiled.run()
+
+            if profiled.completed:
+                profiled.dump(config.profile_dir)
+                profiled.close()
+            if os.path.isfile(profile):
+                output.profile(bench.pallet, summarize(profile))
+
+
 def _build(manifest: str) -> None:
     command = [
         "cargo",
@@ -156,28 +214,116 @@ def _build(manifest: str) -> None:
         raise BenchmarkCargoException(result.stderr.decode("utf-8"))
 
 
+def _load_benchmarks(
+    config: PerformanceConfig, timeline: Timeline
+) -> List[PalletPerformance]:
+    with timeline.span("load"):
+        reference = ReferenceIndex.load(config.reference_values, config.cache_dir)
+        return _prepare_benchmarks(config, reference)
+
+
 def run_pallet_performance(
-    config: PerformanceConfig, to_output: PerformanceOutput
+    config: PerformanceConfig,
+    to_output: PerformanceOutput,
+    timeline: Optional[Timeline] = None,
 ) -> None:
-    to_output.info("Substrate Node Performance check ... ")
+    timeline = timeline or Timeline()
 
-    with open(config.reference_values, "r") as f:
-        s = json.load(f)
+    to_output.info("Substrate Node Performance check ... ")
 
-    benchmarks = _prepare_benchmarks(config, s)
+    benchmarks = _load_benchmarks(config, timeline)
 
-    to_output.info("Compiling - this may take a while...")
+    if config.build:
+        to_output.info("Compiling - this may take a while...")
 
-    _build("node/Cargo.toml")
+        with timeline.span("build"):
+            _build("node/Cargo.toml")
 
     to_output.info("Running benchmarks - this may take a while...")
 
-    _run_benchmarks(benchmarks, to_output)
+    _run_benchmarks(benchmarks, to_output, timeline)
 
-    if [b.acceptable for b in benchmarks].count(False) == 1:
-        # if only one failed - rerun it
-        _run_benchmarks(benchmarks, to_output, True)
+    _rerun_single_failure(benchmarks, to_output, timeline)
 
     to_output.results(benchmarks)
 
     to_output.footnote()
+
+    if config.profile_dir:
+        _profile_failed(benchmarks, config, to_output, timeline)
+
+
+def check_pallet_performance(
+    config: PerformanceConfig,
+    results: Dict[str, BenchmarkParser],
+    to_output: PerformanceOutput,
+    timeline: Optional[Timeline] = None,
+) -> None:
+    """Compare results of benchmarks which already ran with reference values"""
+    timeline = timeline or Timeline()
+
+    to_output.info("Substrate Node Performance check ... ")
+
+    benchmarks = _load_benchmarks(config, timeline)
+
+    for bench in benchmarks:
+        # pallet which failed to run is reported as not acceptable
+        if bench.pallet in results:
+            bench.evaluate(results[bench.pallet])
+
+    # node is already built - single failed pallet runs again as in `pc`
+    _rerun_single_failure(benchmarks, to_output, timeline)
+
+    to_output.results(benchmarks)
+
+    to_output.footnote()
+
+
+def run_calibration(config: PerformanceConfig, to_output: PerformanceOutput) -> None:
+    """Run benchmarks on trusted machine and store results as reference values"""
+    profile = config.reference_profile or DEFAULT_PROFILE
+
+    to_output.info(f"Calibrating reference profile {profile} ... ")
+
+    if config.build:
+        to_output.info("Compiling - this may take a while...")
+
+        _build("node/Cargo.toml")
+
+    to_output.info("Running benchmarks - this may take a while...")
+
+    values = dict()
+    failures = dict()
+    for pallet in config.pallets:
+        cargo = Cargo(pallet=pallet, chain=config.chain)
+        benchmark = Benchmark(pallet, cargo.command())
+        try:
+            benchmark.run()
+
+            if benchmark.is_error:
+                failures[pallet] = benchmark._error_reason
+                to_output.info(f"{pallet}: failed")
+                continue
+
+            values[pallet] = benchmark.parse().extrinsics
+        finally:
+            benchmark.close()
+
+        to_output.info(f"{pallet}: {len(values[pallet])} extrinsics")
+
+    if values:
+        update_reference(config.reference_values, profile, values)
+
+        # rebuild index right away so next check does not have to
+        ReferenceIndex.load(config.reference_values, config.cache_dir)
+
+        to_output.info(f"Reference values stored in {config.reference_values}")
+
+    if failures:
+        # measured pallets are stored - only failed ones have to be calibrated again
+        reasons = "\n".join(
+            f"{pallet}:\n{reason}" for pallet, reason in failures.items()
+        )
+        raise BenchmarkCargoException(
+            f"Calibration failed for {', '.join(failures)}\n{reasons}"
+        )
@@ -0,0 +1,106 @@
+import gzip
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from bench_wizard.exceptions import BenchmarkProfilerException
+
+SAMPLING_FREQUENCY = 99  # Hz
+TOP_FRAMES = 10
+
+_OFFSET = re.compile(r"\+0x[0-9a-f]+$")
+
+
+def record_command(command: List[str], profile: str) -> List[str]:
+    """Wrap command with `perf record` writing samples with call graphs into profile"""
+    if shutil.which("perf") is None:
+        raise BenchmarkProfilerException("perf not found - install linux perf tools")
+
+    return [
+        "perf",
+        "record",
+        "--call-graph=dwarf",
+        f"--freq={SAMPLING_FREQUENCY}",
+        f"--output={profile}",
+        "--",
+    ] + command
+
+
+def _frame(line: str) -> str:
+    # frame line format: `<address> <symbol>+<offset> (<dso>)`
+    parts = line.strip().split(" ", 1)
+    if len(parts) < 2:
+        return "[unknown]"
+    symbol = parts[1].rsplit(" (", 1)[0]
+    return _OFFSET.sub("", symbol)
+
+
+def fold(lines: Iterable[str]) -> Dict[str, int]:
+    """Collapse `perf script` output into folded stacks (root first, `;` separated)"""
+    stacks = Counter()
+    comm = None
+    frames = []
+
+    for line in lines:
+        if not line.strip():
+            if comm is not None:
+                stacks[";".join([comm] + frames[::-1])] += 1
+            comm = None
+            frames = []
+        elif line[0].isspace():
+            frames.append(_frame(line))
+        else:
+            comm = line.split(" ", 1)[0]
+
+    if comm is not None:
+        stacks[";".join([comm] + frames[::-1])] += 1
+
+    return dict(stacks)
+
+
+def hot_frames(
+    stacks: Dict[str, int], top: int = TOP_FRAMES
+) -> List[Tuple[str, float]]:
+    """Frames with the most self samples as (frame, percentage of samples)"""
+    total = sum(stacks.values())
+    if not total:
+        return []
+
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+
+    return [(frame, count * 100 / total) for (frame, count) in leaves.most_common(top)]
+
+
+def summarize(profile: str, top: int = TOP_FRAMES) -> List[Tuple[str, float]]:
+    """Fold recorded profile, store folded stacks and compressed profile next to it"""
+    # script output is many times larger than the profile - fold it as it streams
+    with tempfile.TemporaryFile() as stderr:
+        script = subprocess.Popen(
+            ["perf", "script", f"--input={profile}"],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            encoding="utf-8",
+            errors="replace",
+        )
+        with script:
+            stacks = fold(script.stdout)
+
+        if script.returncode != 0:
+            stderr.seek(0)
+            raise BenchmarkProfilerException(stderr.read().decode("utf-8"))
+
+    with open(f"{profile}.folded", "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+    with open(profile, "rb") as src, gzip.open(f"{profile}.gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(profile)
+
+    return hot_frames(stacks, top)
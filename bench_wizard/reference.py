@@ -0,0 +1,177 @@
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from bench_wizard import cache
+from bench_wizard.exceptions import BenchmarkReferenceException
+
+DEFAULT_PROFILE = "default"
+
+MAGIC = b"BWREF1\n"
+_HEADER_SIZE = struct.Struct("<Q")
+
+
+def _profiles(source: dict) -> Dict[str, dict]:
+    """Reference values per profile.
+
+    Source is either `{pallet: {extrinsic: value}}` (single profile) or
+    `{"profiles": {profile: {pallet: {extrinsic: value}}}}`.
+    """
+    if "profiles" in source:
+        return source["profiles"]
+    return {DEFAULT_PROFILE: source}
+
+
+def _source_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def index_path(source: str, cache_dir: str) -> str:
+    key = cache.fingerprint(os.path.realpath(source))
+    return os.path.join(cache_dir, "reference", f"{key}.idx")
+
+
+def build_index(source: str, path: str) -> None:
+    """Compile reference json into indexed file.
+
+    Layout: magic, header size, json header with offset, size and total of
+    each (profile, pallet) entry, followed by json encoded entries.
+    """
+    size, mtime = _source_stat(source)
+
+    with open(source, "r") as f:
+        profiles = _profiles(json.load(f))
+
+    entries = dict()
+    body = []
+    offset = 0
+    for profile, pallets in profiles.items():
+        entries[profile] = dict()
+        for pallet, values in pallets.items():
+            blob = json.dumps(values, separators=(",", ":")).encode()
+            total = sum(float(value) for value in values.values())
+            entries[profile][pallet] = [offset, len(blob), total]
+            body.append(blob)
+            offset += len(blob)
+
+    header = json.dumps(
+        {"source": [size, mtime], "entries": entries}, separators=(",", ":")
+    ).encode()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        for blob in body:
+            f.write(blob)
+
+    os.replace(tmp, path)
+
+
+class ReferenceIndex:
+    """Reference values read lazily from index - only header is read up front"""
+
+    def __init__(self, path: str):
+        self._path = path
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise BenchmarkReferenceException(f"{path} is not a reference index")
+            (size,) = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+            header = json.loads(f.read(size))
+
+        self._source = tuple(header["source"])
+        self._entries = header["entries"]
+        self._body = len(MAGIC) + _HEADER_SIZE.size + size
+
+    @classmethod
+    def load(cls, source: str, cache_dir: str) -> "ReferenceIndex":
+        """Open index of reference json - index is (re)built when source changed"""
+        path = index_path(source, cache_dir)
+
+        if os.path.isfile(path):
+            try:
+                index = cls(path)
+            except (
+                BenchmarkReferenceException,
+                OSError,
+                ValueError,
+                KeyError,
+                struct.error,
+            ):
+                # unreadable index (eg. interrupted write) is rebuilt like stale one
+                index = None
+            if index is not None and index.source == _source_stat(source):
+                return index
+
+        build_index(source, path)
+        return cls(path)
+
+    @property
+    def source(self) -> Tuple[int, int]:
+        return self._source
+
+    @property
+    def profiles(self) -> List[str]:
+        return list(self._entries)
+
+    def profile(self, name: Optional[str] = None) -> str:
+        """Resolve profile name - can be omitted if there is only one profile"""
+        if name is None and len(self._entries) == 1:
+            return next(iter(self._entries))
+
+        if name not in self._entries:
+            available = ", ".join(self.profiles)
+            raise BenchmarkReferenceException(
+                f"Unknown reference profile {name}, available: {available}"
+            )
+
+        return name
+
+    def _entry(self, profile: str, pallet: str) -> List:
+        try:
+            return self._entries[profile][pallet]
+        except KeyError:
+            raise BenchmarkReferenceException(
+                f"No reference values for {pallet} in profile {profile}"
+            )
+
+    def total(self, profile: str, pallet: str) -> float:
+        return self._entry(profile, pallet)[2]
+
+    def values(self, profile: str, pallet: str) -> Dict[str, float]:
+        offset, size, _ = self._entry(profile, pallet)
+
+        with open(self._path, "rb") as f:
+            f.seek(self._body + offset)
+            return json.loads(f.read(size))
+
+
+def update_reference(
+    source: str, profile: str, values: Dict[str, Dict[str, float]]
+) -> None:
+    """Store reference values of pallets under given profile"""
+    data = dict()
+    if os.path.isfile(source):
+        with open(source, "r") as f:
+            data = json.load(f)
+
+    if "profiles" not in data and profile == DEFAULT_PROFILE:
+        # single profile file stays in its format
+        data.update(values)
+    else:
+        profiles = _profiles(data) if data else dict()
+        profiles.setdefault(profile, dict()).update(values)
+        data = {"profiles": profiles}
+
+    tmp = f"{source}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    os.replace(tmp, source)
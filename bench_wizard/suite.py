@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from bench_wizard.benchmark import (
+    BenchmarksConfig,
+    _build_with_runtime_features,
+    run_pallet_benchmarks,
+)
+from bench_wizard.db_bench import DBPerformanceConfig, run_db_benchmark
+from bench_wizard.hardware import hardware_info
+from bench_wizard.output import Output, PerformanceOutput
+from bench_wizard.performance import PerformanceConfig, check_pallet_performance
+from bench_wizard.timeline import Timeline
+
+
+@dataclass
+class SuiteConfig:
+    pallets: [str]
+    chain: Optional[str] = "dev"
+    reference_values: Optional[str] = None
+    reference_profile: Optional[str] = None
+    substrate_dir: Optional[str] = None
+    dump_results: Optional[str] = None
+    output_dir: Optional[str] = None
+    trace: str = "bench-wizard-trace.json"
+    metrics: str = "bench-wizard.prom"
+
+
+def run_suite(config: SuiteConfig, to_output: Output) -> Timeline:
+    """Build once and run benchmarks, performance check and db benchmark"""
+    hardware = hardware_info()
+    timeline = Timeline(metadata=hardware)
+
+    to_output.info(f"Hardware: {hardware['cpu']} ({hardware['fingerprint']})")
+
+    try:
+        to_output.info("Compiling - this may take a while...")
+
+        with timeline.span("build"):
+            _build_with_runtime_features("node/Cargo.toml")
+
+        with timeline.span("benchmark"):
+            # performance check uses these results - the node does not run again
+            results = run_pallet_benchmarks(
+                BenchmarksConfig(
+                    pallets=config.pallets,
+                    chain=config.chain,
+                    dump_results=config.dump_results,
+                    output_dir=config.output_dir,
+                    build=False,
+                    parse=bool(config.reference_values),
+                ),
+                to_output,
+                timeline,
+            )
+
+        if config.reference_values:
+            with timeline.span("performance"):
+                check_pallet_performance(
+                    PerformanceConfig(
+                        pallets=config.pallets,
+                        reference_values=config.reference_values,
+                        reference_profile=config.reference_profile,
+                        chain=config.chain,
+                    ),
+                    results,
+                    PerformanceOutput(),
+                    timeline,
+                )
+
+        if config.substrate_dir:
+            with timeline.span("db"):
+                run_db_benchmark(
+                    DBPerformanceConfig(substrate_dir=config.substrate_dir), timeline
+                )
+    finally:
+        # written for failed run too - it shows how far the suite got
+        timeline.write_chrome_trace(config.trace)
+        timeline.write_prometheus(config.metrics, {"hardware": hardware["fingerprint"]})
+
+    to_output.timings(timeline)
+    to_output.info(f"\nTrace: {config.trace}\nMetrics: {config.metrics}")
+
+    return timeline
@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+METRIC_NAME = "bench_wizard_step_duration_seconds"
+
+
+@dataclass
+class Span:
+    name: str
+    path: str
+    start: float  # seconds since timeline origin
+    duration: float  # seconds
+    args: Dict[str, str] = field(default_factory=dict)
+
+
+class Timeline:
+    """Records wall-clock time of (nested) pipeline steps"""
+
+    def __init__(self, metadata: Optional[Dict[str, str]] = None):
+        self._origin = time.perf_counter()
+        self._stack = []
+        self._spans = []
+        self._metadata = metadata or dict()
+
+    @property
+    def spans(self) -> List[Span]:
+        return self._spans
+
+    @contextmanager
+    def span(self, name: str, **args: str) -> Iterator[None]:
+        path = "/".join(self._stack + [name])
+        self._stack.append(name)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            self._spans.append(
+                Span(name, path, start - self._origin, end - start, dict(args))
+            )
+
+    def chrome_trace(self) -> dict:
+        """Timeline in Chrome trace event format (chrome://tracing, Perfetto)"""
+        events = [
+            {
+                "name": span.name,
+                "cat": span.path.split("/")[0],
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": dict(span.args, path=span.path),
+            }
+            for span in sorted(self._spans, key=lambda s: s.start)
+        ]
+
+        return {"traceEvents": events, "otherData": self._metadata}
+
+    def prometheus(self, labels: Optional[Dict[str, str]] = None) -> str:
+        """Step durations as Prometheus text exposition format (node exporter textfile)"""
+        durations = dict()
+        for span in self._spans:
+            key = tuple(sorted(dict(labels or {}, step=span.path, **span.args).items()))
+            # repeated steps (eg. reruns) are summed up - label sets must be unique
+            durations[key] = durations.get(key, 0.0) + span.duration
+
+        lines = [
+            f"# HELP {METRIC_NAME} Wall-clock duration of bench-wizard pipeline step",
+            f"# TYPE {METRIC_NAME} gauge",
+        ]
+        for key, duration in durations.items():
+            values = ",".join(f'{name}="{_escape(value)}"' for (name, value) in key)
+            lines.append(f"{METRIC_NAME}{{{values}}} {duration:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def write_prometheus(
+        self, path: str, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        # textfile collector may read the file any time - replace it atomically
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus(labels))
+        os.replace(tmp, path)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,108 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_COMMENT = re.compile(r"//[^\n]*")
+_FUNCTION = re.compile(r"fn\s+(\w+)\s*\([^)]*\)\s*->\s*Weight\s*\{")
+_NUMBER = re.compile(r"\b[0-9][0-9_]*\b")
+_TERM = re.compile(r"\.saturating_add\(")
+_DB_ACCESS = re.compile(r"\.(reads|writes|reads_writes)\(")
+
+TIME = "time"
+
+
+class Term(NamedTuple):
+    """Numeric term of weight function - `time` (base weight, slope) or db access"""
+
+    kind: str
+    value: int
+
+
+@dataclass
+class WeightChange:
+    """Difference of single extrinsic weight between existing and new weight file"""
+
+    extrinsic: str
+    old: Optional[List[Term]]
+    new: Optional[List[Term]]
+    tolerance: float
+
+    @property
+    def percentage(self) -> Optional[float]:
+        """Change of base weight in percent"""
+        if not self.old or not self.new or self.old[0].value == 0:
+            return None
+        return (self.new[0].value - self.old[0].value) / self.old[0].value * 100
+
+    @property
+    def changed(self) -> bool:
+        if self.old is None or self.new is None or len(self.old) != len(self.new):
+            return True
+
+        for old, new in zip(self.old, self.new):
+            if old == new:
+                continue
+            # db reads and writes are counts, not measurements - no tolerance
+            if old.kind != TIME or old.kind != new.kind or old.value == 0:
+                return True
+            if abs(new.value - old.value) / old.value * 100 > self.tolerance:
+                return True
+
+        return False
+
+
+def parse_weights(source: str) -> Dict[str, List[Term]]:
+    """Extract numeric terms (base weight, slopes, reads, writes) of each weight function.
+
+    Only first definition of a function is used - weight files also implement
+    the same functions for `()`.
+    """
+    source = _COMMENT.sub("", source)
+    weights = dict()
+
+    for match in _FUNCTION.finditer(source):
+        name = match.group(1)
+        if name in weights:
+            continue
+
+        depth = 1
+        end = match.end()
+        while depth and end < len(source):
+            if source[end] == "{":
+                depth += 1
+            elif source[end] == "}":
+                depth -= 1
+            end += 1
+
+        body = source[match.end() : end]
+        weights[name] = [
+            Term(kind, int(n.replace("_", "")))
+            for (kind, term) in _terms(body)
+            for n in _NUMBER.findall(term)
+        ]
+
+    return weights
+
+
+def _terms(body: str) -> List[Tuple[str, str]]:
+    """Split function body into `saturating_add` terms as (kind, term)"""
+    terms = []
+    for term in _TERM.split(body):
+        access = _DB_ACCESS.search(term)
+        terms.append((access.group(1) if access else TIME, term))
+    return terms
+
+
+def compare(old: str, new: str, tolerance: float) -> List[WeightChange]:
+    old_weights = parse_weights(old)
+    new_weights = parse_weights(new)
+
+    return [
+        WeightChange(
+            extrinsic=name,
+            old=old_weights.get(name),
+            new=new_weights.get(name),
+            tolerance=tolerance,
+        )
+        for name in sorted(set(old_weights) | set(new_weights))
+    ]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Fake `cargo` executable emitting synthetic substrate benchmark output.
+
+Behaviour is configured with environment variables:
+
+    FAKE_NODE_EXTRINSICS    number of extrinsics per pallet (default 10)
+    FAKE_NODE_COMPONENTS    number of components per extrinsic (default 2)
+    FAKE_NODE_DELAY         seconds each benchmark run takes (default 0)
+    FAKE_NODE_BUILD_DELAY   seconds `cargo build` takes (default 0)
+    FAKE_NODE_FAILURE_RATE  probability of failed benchmark run (default 0)
+    FAKE_NODE_RAW           emit raw data even without `--raw` (default 0)
+    FAKE_NODE_SEED          seed of generated values (default 0)
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List
+
+COMPONENT_NAMES = "abcdefghijklmnopqrstuvwxyz"
+
+FAILURE = b"""Compiling node v1.0.0
+    Finished release [optimized] target(s)
+     Running `target/release/node benchmark`
+Error: Input("Benchmark failed - fake node")
+"""
+
+
+def generate_output(
+    pallet: str,
+    extrinsics: int = 10,
+    components: int = 2,
+    steps: int = 5,
+    repeat: int = 20,
+    raw: bool = False,
+    seed: int = 0,
+) -> bytes:
+    """Synthetic output of `benchmark --pallet` for given pallet"""
+    rng = random.Random(f"{seed}-{pallet}")
+    names = COMPONENT_NAMES[:components]
+    out = []
+
+    for idx in range(extrinsics):
+        base = rng.uniform(10, 500)
+        slopes = [rng.uniform(0, 5) for _ in names]
+
+        out.append(
+            f'Pallet: "{pallet}", Extrinsic: "extrinsic_{idx}", Lowest values: [], '
+            f"Highest values: [], Steps: [{steps}], Repeat: {repeat}"
+        )
+
+        if raw:
+            out.append(
+                "".join(f"{n}," for n in names)
+                + "extrinsic_time_ns,storage_root_time_ns,reads,repeat_reads,"
+                "writes,repeat_writes,proof_size_bytes"
+            )
+            for step in range(steps):
+                values = [step * 10 + 1 for _ in names]
+                for _ in range(repeat):
+                    time_ns = base * 1000 + sum(
+                        s * v * 1000 for (s, v) in zip(slopes, values)
+                    )
+                    time_ns *= rng.gauss(1, 0.02)
+                    row = [str(v) for v in values] + [
+                        str(int(time_ns)),
+                        str(rng.randint(1000, 5000)),
+                        "3",
+                        "0",
+                        "2",
+                        "0",
+                        "0",
+                    ]
+                    out.append(",".join(row))
+            out.append("")
+
+        for analysis in ("Median Slopes Analysis", "Min Squares Analysis"):
+            out.append(analysis)
+            out.append("========")
+            out.append("-- Extrinsic Time --")
+            out.append("")
+            out.append("Model:")
+            out.append(f"Time ~=    {base:.1f}")
+            for name, slope in zip(names, slopes):
+                out.append(f"    + {name}    {slope:.3f}")
+            out.append("              µs")
+            out.append("")
+            out.append("Reads = 3")
+            out.append("Writes = 2")
+
+    return ("\n".join(out) + "\n").encode()
+
+
+def generate_weights(pallet: str, extrinsics: int = 10, seed: int = 0) -> str:
+    rng = random.Random(f"{seed}-{pallet}")
+    functions = "\n".join(
+        f"    fn extrinsic_{idx}() -> Weight {{\n"
+        f"        ({int(rng.uniform(10, 500) * 1_000_000)} as Weight)\n"
+        f"    }}"
+        for idx in range(extrinsics)
+    )
+    return f"impl<T> WeightInfo for Weights<T> {{\n{functions}\n}}\n"
+
+
+def _option(args: List[str], name: str, default: str) -> str:
+    for arg in args:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+
+def main(args: List[str]) -> int:
+    env = os.environ
+
+    if args and args[0] == "build":
+        time.sleep(float(env.get("FAKE_NODE_BUILD_DELAY", 0)))
+        return 0
+
+    pallet = _option(args, "pallet", "pallet")
+    seed = int(env.get("FAKE_NODE_SEED", 0))
+    extrinsics = int(env.get("FAKE_NODE_EXTRINSICS", 10))
+
+    time.sleep(float(env.get("FAKE_NODE_DELAY", 0)))
+
+    if random.Random(f"{seed}-{pallet}-failure").random() < float(
+        env.get("FAKE_NODE_FAILURE_RATE", 0)
+    ):
+        sys.stderr.buffer.write(FAILURE)
+        return 1
+
+    sys.stdout.buffer.write(
+        generate_output(
+            pallet,
+            extrinsics=extrinsics,
+            components=int(env.get("FAKE_NODE_COMPONENTS", 2)),
+            steps=int(_option(args, "steps", "5")),
+            repeat=int(_option(args, "repeat", "20")),
+            raw="--raw" in args or env.get("FAKE_NODE_RAW", "0") == "1",
+            seed=seed,
+        )
+    )
+
+    output = _option(args, "output", "")
+    if output:
+        with open(output, "w") as f:
+            f.write(generate_weights(pallet, extrinsics, seed))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,303 @@
+"""Benchmarks of bench-wizard's own parsing and orchestration overhead.
+
+Node runs are replaced by fake_node.py and times are cpu time of
+bench-wizard's own process, so start-up of the (fake) node is not measured.
+Times are relative to a fixed reference workload (`ref`) measured in the
+same run, so results do not depend on speed of the machine.
+Each suite runs in a fresh interpreter. Results are compared to stored baseline:
+
+    python -m benchmarks.run              # compare with baseline.json
+    python -m benchmarks.run --save       # store results as new baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import stat
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List
+
+from bench_wizard.benchmark import (
+    Benchmark,
+    BenchmarksConfig,
+    _run_benchmarks,
+    run_pallet_benchmarks,
+)
+from bench_wizard.output import Output, PerformanceOutput
+from bench_wizard.parser import BenchmarkParser
+from bench_wizard.performance import PerformanceConfig, run_pallet_performance
+from bench_wizard.timeline import Timeline
+
+from benchmarks.fake_node import generate_output
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+FAKE_NODE = os.path.join(os.path.dirname(__file__), "fake_node.py")
+
+# regression is reported when result is worse than baseline by more than this
+TOLERANCE = 25  # percent
+
+
+@dataclass
+class Measurement:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+@contextlib.contextmanager
+def fake_node(**settings: str) -> Iterator[str]:
+    """Put fake `cargo` on PATH, configured by FAKE_NODE_* settings"""
+    env = dict(os.environ)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_dir = os.path.join(tmp, "bin")
+        os.makedirs(bin_dir)
+
+        cargo = os.path.join(bin_dir, "cargo")
+        with open(cargo, "w") as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_NODE}" "$@"\n')
+        os.chmod(cargo, os.stat(cargo).st_mode | stat.S_IEXEC)
+
+        os.environ["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
+        for name, value in settings.items():
+            os.environ[f"FAKE_NODE_{name.upper()}"] = str(value)
+
+        try:
+            yield tmp
+        finally:
+            os.environ.clear()
+            os.environ.update(env)
+
+
+def _cpu_time(func: Callable[[], None]) -> float:
+    start = time.process_time()
+    func()
+    return time.process_time() - start
+
+
+# csv-like text similar to node output - processing it is unit (`ref`) of cpu times
+REFERENCE_DATA = b"".join(b"%d,%d,3,2\n" % (i, i * 7) for i in range(100_000))
+
+
+def _reference() -> None:
+    sorted(line.decode().split(",")[1] for line in REFERENCE_DATA.splitlines())
+
+
+def _relative_cpu_time(runs: int, func: Callable[[], None]) -> float:
+    """Median cpu time of func in multiples of reference workload run right before it
+
+    Only cpu time of this process counts - node runs are child processes.
+    Speed of the host (frequency scaling, shared runners) cancels out.
+    """
+    ratios = []
+    for _ in range(runs):
+        reference = _cpu_time(_reference)
+        ratios.append(_cpu_time(func) / reference)
+    return statistics.median(ratios)
+
+
+def _peak_memory(func: Callable[[], None]) -> float:
+    """Peak of memory allocated by python during func in MB"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def bench_parser() -> List[Measurement]:
+    output = generate_output("amm", extrinsics=50, steps=10, repeat=250, raw=True)
+    size = len(output) / 1024 / 1024
+
+    elapsed = _relative_cpu_time(10, lambda: BenchmarkParser(output))
+    memory = _peak_memory(lambda: BenchmarkParser(output))
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(output)
+        f.flush()
+        file_memory = _peak_memory(lambda: BenchmarkParser.from_file(f.name))
+
+    return [
+        Measurement("parser_throughput", size / elapsed, "MB/ref", True),
+        Measurement("parser_peak_memory", memory, "MB"),
+        Measurement("parser_file_peak_memory", file_memory, "MB"),
+    ]
+
+
+def bench_scheduling() -> List[Measurement]:
+    pallets = [f"pallet_{idx}" for idx in range(20)]
+    command = ["cargo", "run", "--", "benchmark", "--extrinsic=*"]
+
+    with fake_node(delay=0.01):
+
+        def orchestrated():
+            benchmarks = [Benchmark(p, command + [f"--pallet={p}"]) for p in pallets]
+            with contextlib.redirect_stdout(io.StringIO()):
+                _run_benchmarks(benchmarks, Output(quiet=True), Timeline())
+            for bench in benchmarks:
+                bench.close()
+
+        # wall-clock difference to direct node runs is lost in process start noise
+        scheduled = _relative_cpu_time(10, orchestrated)
+
+    overhead = scheduled / len(pallets) * 1000
+
+    return [Measurement("scheduling_overhead", overhead, "mref/pallet")]
+
+
+def bench_orchestration() -> List[Measurement]:
+    pallets = [f"pallet_{idx}" for idx in range(10)]
+
+    with fake_node(extrinsics=50, failure_rate=0.1) as tmp:
+        dump = os.path.join(tmp, "dump")
+        weights = os.path.join(tmp, "weights")
+        os.makedirs(dump)
+        os.makedirs(weights)
+
+        config = BenchmarksConfig(
+            pallets=pallets, dump_results=dump, output_dir=weights, tolerance=5
+        )
+
+        def benchmarks():
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_pallet_benchmarks(config, Output(quiet=True))
+
+        reference = os.path.join(tmp, "reference.json")
+        with open(reference, "w") as f:
+            json.dump(
+                {p: {f"extrinsic_{i}": 100.0 for i in range(50)} for p in pallets}, f
+            )
+
+        performance_config = PerformanceConfig(
+            pallets=pallets,
+            reference_values=reference,
+            cache_dir=os.path.join(tmp, "cache"),
+        )
+
+        def performance():
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_pallet_performance(
+                    performance_config, PerformanceOutput(quiet=True)
+                )
+
+        # wall-clock time is dominated by fake node start-up
+        benchmarks_cpu = _relative_cpu_time(10, benchmarks)
+        performance_cpu = _relative_cpu_time(10, performance)
+
+    # verbose output of many pallets - memory should not grow with number of pallets
+    with fake_node(extrinsics=50, raw=1):
+        config = BenchmarksConfig(pallets=[f"pallet_{idx}" for idx in range(20)])
+
+        def session():
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_pallet_benchmarks(config, Output(quiet=True))
+
+        session_memory = _peak_memory(session)
+
+    return [
+        Measurement("pallet_benchmarks_cpu", benchmarks_cpu * 1000, "mref"),
+        Measurement("pallet_performance_cpu", performance_cpu * 1000, "mref"),
+        Measurement("session_peak_memory", session_memory, "MB"),
+    ]
+
+
+SUITES: Dict[str, Callable[[], List[Measurement]]] = {
+    "parser": bench_parser,
+    "scheduling": bench_scheduling,
+    "orchestration": bench_orchestration,
+}
+
+
+def _run_isolated(name: str) -> List[Measurement]:
+    """Run suite in fresh interpreter - state left by other suites skews cpu times"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--measure", name],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return [Measurement(**m) for m in json.loads(result.stdout)]
+
+
+def _compare(measurement: Measurement, baseline: Dict[str, float]) -> str:
+    if measurement.name not in baseline:
+        return "no baseline"
+
+    reference = baseline[measurement.name]
+    diff = measurement.value - reference
+    worse = -diff if measurement.higher_is_better else diff
+
+    if reference == 0:
+        # relative change is not defined - any worsening is a regression
+        note = "REGRESSION" if worse > 0 else "OK"
+        return f"{diff:+.2f} {measurement.unit} {note}"
+
+    change = diff / reference * 100
+    note = "REGRESSION" if worse / reference * 100 > TOLERANCE else "OK"
+    return f"{change:+.1f}% {note}"
+
+
+def main(args: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("suites", nargs="*", help=f"any of {', '.join(SUITES)}")
+    parser.add_argument("--save", action="store_true", help="store as new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--measure", choices=SUITES, help=argparse.SUPPRESS)
+    options = parser.parse_args(args)
+
+    if options.measure:
+        # single suite run by _run_isolated
+        print(json.dumps([asdict(m) for m in SUITES[options.measure]()]))
+        return 0
+
+    if shutil.which("sh") is None:
+        print("fake node requires posix shell", file=sys.stderr)
+        return 1
+
+    unknown = set(options.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    baseline = dict()
+    if os.path.isfile(options.baseline):
+        with open(options.baseline, "r") as f:
+            baseline = json.load(f)
+
+    measurements = []
+    for name in options.suites or SUITES:
+        measurements.extend(_run_isolated(name))
+
+    print(f"{'Benchmark':^34}|{'Result':^24}|{'Baseline':^14}| Change")
+
+    regressions = 0
+    for m in measurements:
+        result = f"{m.value:.2f} {m.unit}"
+        reference = f"{baseline[m.name]:.2f}" if m.name in baseline else "-"
+        change = _compare(m, baseline)
+        regressions += "REGRESSION" in change
+        print(f"{m.name:<34}| {result:^22} | {reference:^12} | {change}")
+
+    if options.save:
+        baseline.update({m.name: round(m.value, 3) for m in measurements})
+        with open(options.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    return 1 if regressions and not options.save else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,47 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bench_wizard.analysis import analyse_extrinsic, to_array
+
+COLUMNS = ["a", "b", "extrinsic_time_ns", "storage_root_time_ns"]
+
+
+def _rows(a, b, time):
+    return [f"{x},{y},{t},0" for (x, y, t) in zip(a, b, time)]
+
+
+def test_to_array():
+    data = to_array(COLUMNS, ["1,2,3,4", "5,6,7,8"])
+    assert data.shape == (2, 4)
+    assert data[1, 2] == 7
+
+
+def test_linear_components():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 100, 10000)
+    b = rng.integers(0, 50, 10000)
+    time = 1000 + 20 * a + 5 * b + rng.normal(0, 1, 10000)
+
+    result = analyse_extrinsic("sell", COLUMNS, _rows(a, b, time))
+
+    assert result.samples == 10000
+    assert result.base == pytest.approx(1000, rel=0.01)
+    assert result.slopes["a"] == pytest.approx(20, rel=0.01)
+    assert result.slopes["b"] == pytest.approx(5, rel=0.01)
+    assert result.r_squared > 0.99
+    assert result.non_linear == []
+
+
+def test_non_linear_component_and_outliers():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 100, 1000)
+    b = np.zeros(1000, dtype=int)
+    time = 1000 + 3 * a**2 + rng.normal(0, 1, 1000)
+    time[:5] += 1_000_000
+
+    result = analyse_extrinsic("buy", COLUMNS, _rows(a, b, time))
+
+    assert result.non_linear == ["a"]
+    assert result.outliers >= 5
+    assert result.warnings
@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+import bench_wizard.benchmark
+from bench_wizard.benchmark import (
+    ERROR_TAIL,
+    Benchmark,
+    BenchmarksConfig,
+    _update_weight_file,
+    run_pallet_benchmarks,
+)
+from bench_wizard.output import Output
+from benchmarks.fake_node import generate_output, generate_weights
+from benchmarks.run import fake_node
+
+
+def test_output_is_spooled_to_file(tmp_path):
+    bench = Benchmark("amm", [sys.executable, "-c", "print('x' * 100000)"])
+    bench.run()
+
+    assert bench.completed
+    assert os.path.getsize(bench.output) == 100001
+
+    bench.dump(str(tmp_path))
+    assert (tmp_path / "amm.results").read_bytes() == b"x" * 100000 + b"\n"
+
+    spool = bench.output
+    bench.close()
+    assert not os.path.exists(spool)
+
+
+def test_only_error_tail_is_kept():
+    script = (
+        "import sys; "
+        "sys.stderr.write('noise\\n' * 10000 + 'Error: failed\\n'); "
+        "sys.exit(1)"
+    )
+    bench = Benchmark("amm", [sys.executable, "-c", script])
+    bench.run()
+
+    assert bench.is_error
+    assert bench.output is None
+    assert len(bench._error_reason) == ERROR_TAIL
+    assert bench._error_reason.split("\n")[-2] == "Error: failed"
+
+
+def test_spool_file_is_removed_when_command_cannot_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    bench = Benchmark("amm", [str(tmp_path / "missing-cargo")])
+
+    with pytest.raises(FileNotFoundError):
+        bench.run()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_written_weights_do_not_invalidate_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("weights")
+    with open(os.path.join("weights", "amm.rs"), "w") as f:
+        f.write(generate_weights("amm", seed=1))
+
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="test",
+        GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="test",
+        GIT_COMMITTER_EMAIL="test@example.com",
+    )
+    for command in (["init", "-q"], ["add", "."], ["commit", "-q", "-m", "init"]):
+        subprocess.run(["git"] + command, check=True, env=env)
+
+    config = BenchmarksConfig(
+        pallets=["amm"], output_dir="weights", cache_dir=".bench-wizard", build=False
+    )
+
+    with fake_node(extrinsics=2):
+        run_pallet_benchmarks(config, Output())
+        # tracked weight file was rewritten by the first run
+        assert subprocess.run(["git", "diff", "--quiet"]).returncode == 1
+        capsys.readouterr()
+
+        run_pallet_benchmarks(config, Output())
+
+    assert "All results cached - nothing to run" in capsys.readouterr().out
+    # output is cached as it is
+    (entry,) = os.listdir(os.path.join(".bench-wizard", "results"))
+    with open(os.path.join(".bench-wizard", "results", entry), "rb") as f:
+        assert f.read() == generate_output("amm", 2)
+
+
+def test_profile_does_not_affect_results(tmp_path, monkeypatch):
+    def record_command(command, profile):
+        # stand-in profiler creates the profile and changes output of the node
+        script = '"$@"; status=$?; touch "$0"; exit $status'
+        return ["sh", "-c", script, profile, "env", "FAKE_NODE_SEED=7"] + command
+
+    monkeypatch.setattr(bench_wizard.benchmark, "record_command", record_command)
+    monkeypatch.setattr(bench_wizard.benchmark, "summarize", lambda p: [])
+
+    config = BenchmarksConfig(
+        pallets=["amm"],
+        output_dir=str(tmp_path),
+        dump_results=str(tmp_path),
+        profile=True,
+        build=False,
+    )
+
+    with fake_node(extrinsics=2):
+        run_pallet_benchmarks(config, Output(quiet=True))
+
+    assert (tmp_path / "amm.rs").read_text() == generate_weights("amm", 2)
+    assert (tmp_path / "amm.results").read_bytes() == generate_output("amm", 2)
+    assert (tmp_path / "amm.perf.data").exists()
+
+
+def test_weight_file_is_rewritten_when_read_count_changes(tmp_path):
+    current = """fn sell() -> Weight {
+        (100_000_000 as Weight)
+            .saturating_add(T::DbWeight::get().reads(11 as Weight))
+    }
+"""
+    generated = current.replace("reads(11 ", "reads(12 ")
+    (tmp_path / "amm.rs").write_text(current)
+    (tmp_path / "amm.rs.new").write_text(generated)
+
+    config = BenchmarksConfig(pallets=["amm"], output_dir=str(tmp_path), tolerance=10)
+    _update_weight_file("amm", config, Output(quiet=True))
+
+    assert (tmp_path / "amm.rs").read_text() == generated
+    assert not (tmp_path / "amm.rs.new").exists()
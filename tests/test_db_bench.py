@@ -0,0 +1,85 @@
+import os
+import stat
+import subprocess
+
+import pytest
+
+from bench_wizard.db_bench import (
+    StorageBenchmarkConfig,
+    bucket_records,
+    size_bucket,
+    storage_benchmark,
+)
+
+# writes measured records to json path options and counts runs
+FAKE_CARGO = """#!/bin/sh
+echo run >> runs
+for arg in "$@"; do
+    case "$arg" in
+        --json-*-path=*) echo '{"ns_per_size": [[32, 100], [64, 200]]}' > "${arg#*=}";;
+    esac
+done
+"""
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [(0, 0), (1, 1), (2, 2), (3, 4), (32, 32), (33, 64), (1000, 1024)],
+)
+def test_size_bucket(size, expected):
+    assert size_bucket(size) == expected
+
+
+def test_bucket_records():
+    records = [(30, 100), (32, 300), (33, 1000), (60, 2000), (64, 3000)]
+
+    stats = bucket_records(records)
+
+    assert [bucket["size"] for bucket in stats] == [32, 64]
+    assert stats[0]["count"] == 2
+    assert stats[0]["average"] == 200
+    assert stats[1]["median"] == 2000
+    assert stats[1]["p99"] == 3000
+
+
+def test_bucket_records_uses_all_records():
+    records = [(32, idx) for idx in range(20000)]
+
+    stats = bucket_records(records)
+
+    assert stats[0]["count"] == 20000
+    assert stats[0]["p99"] == 19800
+
+
+def test_storage_benchmark_measures_unless_reuse_requested(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cargo = tmp_path / "cargo"
+    cargo.write_text(FAKE_CARGO)
+    cargo.chmod(cargo.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    subprocess.run(["git", "init", "-q"], check=True)
+    subprocess.run(
+        ["git", "commit", "-q", "--allow-empty", "-m", "init"],
+        check=True,
+        env=dict(
+            os.environ,
+            GIT_AUTHOR_NAME="test",
+            GIT_AUTHOR_EMAIL="test@example.com",
+            GIT_COMMITTER_NAME="test",
+            GIT_COMMITTER_EMAIL="test@example.com",
+        ),
+    )
+    (tmp_path / "db").mkdir()
+    (tmp_path / "db" / "000001.sst").write_bytes(b"data")
+
+    config = StorageBenchmarkConfig(base_path="db")
+
+    results = storage_benchmark(config)
+    assert [bucket["size"] for bucket in results["read"]] == [32, 64]
+    storage_benchmark(config)
+    assert (tmp_path / "runs").read_text().count("run") == 2
+
+    config.reuse = True
+    assert storage_benchmark(config) == results
+    assert (tmp_path / "runs").read_text().count("run") == 2
@@ -0,0 +1,46 @@
+import contextlib
+import io
+
+from bench_wizard.benchmark import BenchmarksConfig, run_pallet_benchmarks
+from bench_wizard.output import Output
+from bench_wizard.parser import BenchmarkParser
+from benchmarks.fake_node import generate_output
+from benchmarks.run import Measurement, _compare, fake_node
+
+
+def test_generated_output_is_parsed():
+    parser = BenchmarkParser(
+        generate_output("amm", extrinsics=3, steps=2, repeat=4, raw=True)
+    )
+
+    assert parser.pallet == "amm"
+    assert parser.total_time(["extrinsic_0", "extrinsic_1", "extrinsic_2"]) > 0
+    columns, rows = parser.raw_data["extrinsic_2"]
+    assert columns[:3] == ["a", "b", "extrinsic_time_ns"]
+    assert len(rows) == 8
+
+
+def test_orchestration_with_fake_node(tmp_path):
+    pallets = [f"pallet_{idx}" for idx in range(6)]
+    config = BenchmarksConfig(pallets=pallets, dump_results=str(tmp_path))
+
+    with fake_node(extrinsics=2, failure_rate=0.5):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_pallet_benchmarks(config, Output(quiet=True))
+
+    dumped = sorted(p.name for p in tmp_path.iterdir())
+    # failure is deterministic per pallet - some, but not all, pallets fail
+    assert 0 < len(dumped) < len(pallets)
+    assert all(name.endswith(".results") for name in dumped)
+
+
+def test_compare_with_baseline():
+    latency = Measurement("latency", 130.0, "ms")
+    throughput = Measurement("throughput", 130.0, "MB/s", higher_is_better=True)
+
+    assert _compare(latency, {}) == "no baseline"
+    assert _compare(latency, {"latency": 100.0}) == "+30.0% REGRESSION"
+    assert _compare(throughput, {"throughput": 100.0}) == "+30.0% OK"
+    # zero is a measured baseline, not a missing one
+    assert _compare(latency, {"latency": 0.0}) == "+130.00 ms REGRESSION"
+    assert _compare(throughput, {"throughput": 0.0}) == "+130.00 MB/s OK"
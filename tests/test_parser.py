@@ -63,3 +63,76 @@ def test_parser(extrinsics, expected):
     parser = BenchmarkParser(BENCHMARK_RESULT.encode())
     assert parser.pallet == "amm"
     assert parser.total_time(extrinsics) == expected
+
+
+RAW_BENCHMARK_RESULT = r"""
+Pallet: "amm", Extrinsic: "sell", Lowest values: [], Highest values: [], Steps: [5], Repeat: 2
+a,b,extrinsic_time_ns,storage_root_time_ns,reads,repeat_reads,writes,repeat_writes,proof_size_bytes
+1,10,1000,50,3,0,2,0,0
+1,10,1010,50,3,0,2,0,0
+5,10,2000,50,3,0,2,0,0
+
+Median Slopes Analysis
+========
+-- Extrinsic Time --
+
+Model:
+Time ~=    1.5
+              µs
+
+Pallet: "amm", Extrinsic: "buy", Lowest values: [], Highest values: [], Steps: [5], Repeat: 2
+extrinsic_time_ns,storage_root_time_ns,reads,repeat_reads,writes,repeat_writes,proof_size_bytes
+900,50,3,0,2,0,0
+
+Median Slopes Analysis
+========
+-- Extrinsic Time --
+
+Model:
+Time ~=    0.9
+              µs
+"""
+
+
+def test_parser_raw_data():
+    parser = BenchmarkParser(RAW_BENCHMARK_RESULT.encode())
+
+    assert parser.total_time(["sell", "buy"]) == 2.4
+
+    columns, rows = parser.raw_data["sell"]
+    assert columns[:3] == ["a", "b", "extrinsic_time_ns"]
+    assert rows == [
+        "1,10,1000,50,3,0,2,0,0",
+        "1,10,1010,50,3,0,2,0,0",
+        "5,10,2000,50,3,0,2,0,0",
+    ]
+
+    columns, rows = parser.raw_data["buy"]
+    assert columns[0] == "extrinsic_time_ns"
+    assert rows == ["900,50,3,0,2,0,0"]
+
+
+def test_parser_without_raw_data():
+    parser = BenchmarkParser(BENCHMARK_RESULT.encode())
+    assert parser.raw_data == {}
+
+
+def test_parser_from_file(tmp_path):
+    path = tmp_path / "amm.results"
+    path.write_bytes(RAW_BENCHMARK_RESULT.encode())
+
+    parser = BenchmarkParser.from_file(str(path))
+
+    assert parser.pallet == "amm"
+    assert parser.total_time(["sell", "buy"]) == 2.4
+    assert len(parser.raw_data["sell"][1]) == 3
+
+
+def test_parser_from_empty_file(tmp_path):
+    path = tmp_path / "empty.results"
+    path.write_bytes(b"")
+
+    parser = BenchmarkParser.from_file(str(path))
+
+    assert parser.pallet is None
+    assert parser.total_time(["sell"]) == 0.0
@@ -0,0 +1,70 @@
+import json
+import tempfile
+
+import pytest
+
+from bench_wizard.exceptions import BenchmarkCargoException
+from bench_wizard.output import PerformanceOutput
+from bench_wizard.parser import BenchmarkParser
+from bench_wizard.performance import (
+    PalletPerformance,
+    PerformanceConfig,
+    run_calibration,
+    run_pallet_performance,
+)
+from bench_wizard.timeline import Timeline
+from benchmarks.run import fake_node
+
+
+def test_calibration_stores_pallets_measured_before_failure(tmp_path):
+    pallets = [f"pallet_{idx}" for idx in range(6)]
+    reference = tmp_path / "reference.json"
+    config = PerformanceConfig(
+        pallets=pallets,
+        reference_values=str(reference),
+        build=False,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    with fake_node(extrinsics=2, failure_rate=0.5):
+        with pytest.raises(BenchmarkCargoException) as error:
+            run_calibration(config, PerformanceOutput(quiet=True))
+
+    stored = json.loads(reference.read_text())
+    failed = [pallet for pallet in pallets if pallet not in stored]
+    # failure is deterministic per pallet - some, but not all, pallets fail
+    assert 0 < len(failed) < len(pallets)
+    assert str(error.value).startswith(f"Calibration failed for {', '.join(failed)}")
+    assert all(len(values) == 2 for values in stored.values())
+
+
+def test_spool_file_is_removed_when_parsing_fails(tmp_path, monkeypatch):
+    def from_file(path):
+        raise OSError("cannot map file")
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(BenchmarkParser, "from_file", from_file)
+
+    with fake_node(extrinsics=2):
+        with pytest.raises(OSError):
+            PalletPerformance("amm", 1000.0, ["extrinsic_0"]).run()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pallets_which_failed_to_run_are_not_profiled(tmp_path):
+    reference = tmp_path / "reference.json"
+    reference.write_text(json.dumps({"amm": {"extrinsic_0": 1000.0}}))
+    config = PerformanceConfig(
+        pallets=["amm"],
+        reference_values=str(reference),
+        profile_dir=str(tmp_path / "profiles"),
+        build=False,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    timeline = Timeline()
+
+    with fake_node(extrinsics=2, failure_rate=1.0):
+        run_pallet_performance(config, PerformanceOutput(quiet=True), timeline)
+
+    assert "profile" not in [span.name for span in timeline.spans]
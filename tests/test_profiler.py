@@ -0,0 +1,62 @@
+import gzip
+import os
+import stat
+
+from bench_wizard.profiler import fold, hot_frames, summarize
+
+PERF_SCRIPT = """node 1234 [000] 100.000001:   10101 cycles:u:
+\t    7f0000000001 memcpy+0x1f (/usr/lib/libc.so.6)
+\t    55d000000002 pallet_amm::sell+0x10 (/node)
+\t    55d000000003 main+0x5 (/node)
+
+node 1234 [000] 100.000002:   10101 cycles:u:
+\t    7f0000000001 memcpy+0x1f (/usr/lib/libc.so.6)
+\t    55d000000002 pallet_amm::sell+0x10 (/node)
+\t    55d000000003 main+0x5 (/node)
+
+node 1234 [000] 100.000003:   10101 cycles:u:
+\t    55d000000004 pallet_amm::buy+0x20 (/node)
+\t    55d000000003 main+0x5 (/node)
+"""
+
+
+def test_fold():
+    stacks = fold(PERF_SCRIPT.splitlines(keepends=True))
+
+    assert stacks == {
+        "node;main;pallet_amm::sell;memcpy": 2,
+        "node;main;pallet_amm::buy": 1,
+    }
+
+
+def test_hot_frames():
+    frames = hot_frames(fold(PERF_SCRIPT.splitlines(keepends=True)), top=1)
+
+    assert len(frames) == 1
+    assert frames[0][0] == "memcpy"
+    assert round(frames[0][1], 2) == 66.67
+
+
+def test_hot_frames_empty():
+    assert hot_frames({}) == []
+
+
+def test_summarize(tmp_path, monkeypatch):
+    script = tmp_path / "script.txt"
+    script.write_text(PERF_SCRIPT)
+    perf = tmp_path / "perf"
+    perf.write_text(f"#!/bin/sh\ncat {script}\n")
+    perf.chmod(perf.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    profile = tmp_path / "amm.perf.data"
+    profile.write_bytes(b"samples")
+
+    frames = summarize(str(profile), top=1)
+
+    assert frames[0][0] == "memcpy"
+    assert (tmp_path / "amm.perf.data.folded").read_text() == (
+        "node;main;pallet_amm::buy 1\nnode;main;pallet_amm::sell;memcpy 2\n"
+    )
+    assert gzip.open(tmp_path / "amm.perf.data.gz").read() == b"samples"
+    assert not profile.exists()
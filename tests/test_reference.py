@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from bench_wizard.exceptions import BenchmarkReferenceException
+from bench_wizard.reference import (
+    DEFAULT_PROFILE,
+    ReferenceIndex,
+    index_path,
+    update_reference,
+)
+
+SINGLE = {"amm": {"sell": "300.5", "buy": 200}, "exchange": {"sell": 100}}
+
+MULTI = {
+    "profiles": {
+        "v1-ref": {"amm": {"sell": 300, "buy": 200}},
+        "v2-ref": {"amm": {"sell": 250, "buy": 150}},
+    }
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_single_profile_index(tmp_path):
+    source = _write(tmp_path / "ref.json", SINGLE)
+
+    index = ReferenceIndex.load(source, str(tmp_path / "cache"))
+
+    profile = index.profile()
+    assert profile == DEFAULT_PROFILE
+    assert index.total(profile, "amm") == 500.5
+    assert index.values(profile, "amm") == {"sell": "300.5", "buy": 200}
+    assert index.values(profile, "exchange") == {"sell": 100}
+
+    with pytest.raises(BenchmarkReferenceException):
+        index.total(profile, "unknown")
+
+
+def test_multi_profile_index(tmp_path):
+    source = _write(tmp_path / "ref.json", MULTI)
+
+    index = ReferenceIndex.load(source, str(tmp_path / "cache"))
+
+    assert index.profiles == ["v1-ref", "v2-ref"]
+    assert index.total("v2-ref", "amm") == 400
+    with pytest.raises(BenchmarkReferenceException):
+        index.profile()
+
+
+def test_index_is_rebuilt_when_source_changes(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    source = _write(tmp_path / "ref.json", SINGLE)
+
+    ReferenceIndex.load(source, cache_dir)
+    assert os.path.isfile(index_path(source, cache_dir))
+
+    _write(tmp_path / "ref.json", {"amm": {"sell": 1, "buy": 2, "add": 3}})
+    index = ReferenceIndex.load(source, cache_dir)
+
+    assert index.total(DEFAULT_PROFILE, "amm") == 6
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: b"garbage" + data,
+        lambda data: data[:10],
+        lambda data: data[:30],
+    ],
+    ids=["magic", "header size", "header"],
+)
+def test_corrupted_index_is_rebuilt(tmp_path, corrupt):
+    cache_dir = str(tmp_path / "cache")
+    source = _write(tmp_path / "ref.json", SINGLE)
+
+    ReferenceIndex.load(source, cache_dir)
+    path = index_path(source, cache_dir)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(corrupt(data))
+
+    index = ReferenceIndex.load(source, cache_dir)
+
+    assert index.total(DEFAULT_PROFILE, "exchange") == 100
+
+
+def test_update_reference(tmp_path):
+    source = str(tmp_path / "ref.json")
+
+    update_reference(source, DEFAULT_PROFILE, {"amm": {"sell": 1.0}})
+    with open(source) as f:
+        assert json.load(f) == {"amm": {"sell": 1.0}}
+
+    update_reference(source, "v2-ref", {"amm": {"sell": 2.0}})
+    with open(source) as f:
+        assert json.load(f) == {
+            "profiles": {
+                DEFAULT_PROFILE: {"amm": {"sell": 1.0}},
+                "v2-ref": {"amm": {"sell": 2.0}},
+            }
+        }
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from bench_wizard.exceptions import BenchmarkReferenceException
+from bench_wizard.output import Output
+from bench_wizard.suite import SuiteConfig, run_suite
+from benchmarks.run import fake_node
+
+
+def _config(tmp_path, reference: dict) -> SuiteConfig:
+    reference_values = tmp_path / "reference.json"
+    reference_values.write_text(json.dumps(reference))
+
+    return SuiteConfig(
+        pallets=["amm", "exchange"],
+        reference_values=str(reference_values),
+        trace=str(tmp_path / "trace.json"),
+        metrics=str(tmp_path / "metrics.prom"),
+    )
+
+
+def test_performance_check_uses_benchmark_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reference = {
+        pallet: {f"extrinsic_{idx}": 1000.0 for idx in range(2)}
+        for pallet in ("amm", "exchange")
+    }
+
+    with fake_node(extrinsics=2):
+        timeline = run_suite(_config(tmp_path, reference), Output(quiet=True))
+
+    runs = [span.path for span in timeline.spans if span.name == "run"]
+    assert runs == ["benchmark/run", "benchmark/run"]
+    assert (tmp_path / "trace.json").exists()
+
+
+def test_trace_is_written_when_suite_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reference = {"amm": {"extrinsic_0": 1000.0}}
+
+    with fake_node(extrinsics=2):
+        with pytest.raises(BenchmarkReferenceException):
+            run_suite(_config(tmp_path, reference), Output(quiet=True))
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert "benchmark" in [event["name"] for event in trace["traceEvents"]]
+    assert (tmp_path / "metrics.prom").exists()
+
+
+def test_single_failed_pallet_runs_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reference = {
+        pallet: {f"extrinsic_{idx}": 1000.0 for idx in range(2)}
+        for pallet in ("amm", "exchange")
+    }
+    reference["amm"] = {f"extrinsic_{idx}": 0.001 for idx in range(2)}
+
+    with fake_node(extrinsics=2):
+        timeline = run_suite(_config(tmp_path, reference), Output(quiet=True))
+
+    runs = [(span.path, span.args) for span in timeline.spans if span.name == "run"]
+    assert runs[-1] == ("performance/run", {"pallet": "amm"})
@@ -0,0 +1,54 @@
+import json
+
+from bench_wizard.timeline import METRIC_NAME, Timeline
+
+
+def _timeline() -> Timeline:
+    timeline = Timeline(metadata={"cpu": "test"})
+
+    with timeline.span("benchmark"):
+        with timeline.span("run", pallet="amm"):
+            pass
+        with timeline.span("run", pallet="amm"):
+            pass
+        with timeline.span("run", pallet='x"y'):
+            pass
+
+    return timeline
+
+
+def test_spans():
+    spans = _timeline().spans
+
+    assert [s.path for s in spans] == [
+        "benchmark/run",
+        "benchmark/run",
+        "benchmark/run",
+        "benchmark",
+    ]
+    assert spans[0].args == {"pallet": "amm"}
+    assert spans[-1].duration >= sum(s.duration for s in spans[:-1])
+
+
+def test_chrome_trace():
+    trace = json.loads(json.dumps(_timeline().chrome_trace()))
+
+    events = trace["traceEvents"]
+    assert trace["otherData"] == {"cpu": "test"}
+    assert events[0]["name"] == "benchmark"
+    assert events[0]["ph"] == "X"
+    assert events[1]["args"] == {"pallet": "amm", "path": "benchmark/run"}
+    assert events[1]["ts"] >= events[0]["ts"]
+
+
+def test_prometheus():
+    lines = _timeline().prometheus({"hardware": "abc"}).splitlines()
+
+    assert lines[1] == f"# TYPE {METRIC_NAME} gauge"
+    samples = lines[2:]
+    # repeated runs of the same pallet are merged into one sample
+    assert len(samples) == 3
+    assert samples[0].startswith(
+        f'{METRIC_NAME}{{hardware="abc",pallet="amm",step="benchmark/run"}} '
+    )
+    assert f'pallet="x\\"y"' in samples[1]
@@ -0,0 +1,75 @@
+import pytest
+
+from bench_wizard.weights import Term, compare, parse_weights
+
+WEIGHTS = """
+pub trait WeightInfo {
+    fn create_pool() -> Weight;
+    fn sell(a: u32, ) -> Weight;
+}
+
+impl<T: frame_system::Config> WeightInfo for HydraWeight<T> {
+    // Storage: AMM ShareToken (r:1 w:1)
+    fn create_pool() -> Weight {
+        (347_200_000 as Weight)
+            .saturating_add(T::DbWeight::get().reads(11 as Weight))
+            .saturating_add(T::DbWeight::get().writes(13 as Weight))
+    }
+    fn sell(a: u32, ) -> Weight {
+        Weight::from_ref_time(100_000_000 as u64)
+            .saturating_add(Weight::from_ref_time(2_000 as u64).saturating_mul(a as u64))
+    }
+}
+
+impl WeightInfo for () {
+    fn create_pool() -> Weight {
+        (1 as Weight)
+    }
+    fn sell(a: u32, ) -> Weight {
+        (1 as Weight)
+    }
+}
+"""
+
+
+def test_parse_weights():
+    assert parse_weights(WEIGHTS) == {
+        "create_pool": [
+            Term("time", 347_200_000),
+            Term("reads", 11),
+            Term("writes", 13),
+        ],
+        "sell": [Term("time", 100_000_000), Term("time", 2_000)],
+    }
+
+
+@pytest.mark.parametrize(
+    "new_base, changed",
+    [("347_200_000", False), ("350_000_000", False), ("400_000_000", True)],
+)
+def test_compare_tolerance(new_base, changed):
+    new = WEIGHTS.replace("347_200_000", new_base)
+
+    changes = {c.extrinsic: c for c in compare(WEIGHTS, new, tolerance=5)}
+
+    assert changes["create_pool"].changed is changed
+    assert changes["sell"].changed is False
+    assert changes["sell"].percentage == 0
+
+
+def test_compare_new_file():
+    changes = compare("", WEIGHTS, tolerance=5)
+
+    assert [c.extrinsic for c in changes] == ["create_pool", "sell"]
+    assert all(c.changed for c in changes)
+    assert changes[0].percentage is None
+
+
+@pytest.mark.parametrize(
+    "old, new", [("reads(11 ", "reads(12 "), ("writes(13 ", "writes(14 ")]
+)
+def test_compare_db_access_is_exact(old, new):
+    changes = {c.extrinsic: c for c in compare(WEIGHTS, WEIGHTS.replace(old, new), 10)}
+
+    assert changes["create_pool"].changed is True
+    assert changes["create_pool"].percentage == 0